@@ -12,6 +12,10 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+from dotenv import load_dotenv
+
+# Read .env once per process, before anything below (or in ml_layer) reads the environment
+load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -88,6 +92,10 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "postgres"),
         "HOST": os.getenv("POSTGRES_HOST", "localhost"),
         "PORT": os.getenv("POSTGRES_PORT", "5433"),
+        "OPTIONS": {
+            # Search breadth for the HNSW index on SeedImage.embedding (higher = better recall, slower)
+            "options": f"-c hnsw.ef_search={os.getenv('PGVECTOR_EF_SEARCH', '40')}",
+        },
     }
 }
 
@@ -25,9 +25,13 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/upload/", views.upload_seed, name="upload_seed"),
     path("api/certify/", views.certify_seed, name="certify_seed"),
+    path("api/certify/bulk/", views.certify_bulk, name="certify_bulk"),
+    path("api/certify/<int:job_id>/", views.certify_status, name="certify_status"),
     path("api/verify/", views.verify_seed, name="verify_seed"),
     path("api/history/", views.history, name="history"),
     path("api/database/", views.database, name="database"),
+    path("api/export/", views.export_seeds, name="export_seeds"),
+    path("api/stats/", views.seed_stats, name="seed_stats"),
     path("api/signers/", views.get_signers, name="get_signers"),
     path("result/<int:pk>/", views.result, name="result"),
 ]
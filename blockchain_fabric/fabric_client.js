@@ -103,6 +103,35 @@ app.post('/certify', async (req, res) => {
     }
 });
 
+// Create many seed records in one request (bulk certification)
+app.post('/certify/batch', async (req, res) => {
+    const records = req.body.records || [];
+    console.log(`[CERTIFY BATCH] Received ${records.length} records`);
+
+    const settled = await Promise.allSettled(records.map(async ({ seedId, className, hash, timestamp }) => {
+        const resultBytes = await contract.submitTransaction(
+            'CreateSeedRecord',
+            seedId,
+            className,
+            hash,
+            timestamp
+        );
+        const record = JSON.parse(Buffer.from(resultBytes).toString('utf8'));
+        return { seedId, success: true, transactionId: record.tx_id };
+    }));
+
+    const results = settled.map((outcome, i) => {
+        if (outcome.status === 'fulfilled') {
+            return outcome.value;
+        }
+        console.error(`[CERTIFY BATCH] ERROR for seedId ${records[i].seedId}:`, outcome.reason.message);
+        return { seedId: records[i].seedId, success: false, error: outcome.reason.message };
+    });
+
+    console.log(`[CERTIFY BATCH] ${results.filter(r => r.success).length}/${records.length} certified`);
+    res.json({ results, type: 'fabric' });
+});
+
 // Get seed record (verification)
 app.get('/verify/:seedId', async (req, res) => {
     try {
@@ -120,10 +149,45 @@ app.get('/verify/:seedId', async (req, res) => {
         res.json(result);
     } catch (error) {
         console.error(`[VERIFY] ERROR for seedId ${req.params.seedId}:`, error.message);
-        res.status(404).json({ error: 'Seed not found or invalid' });
+        if (isNotFound(error)) {
+            res.status(404).json({ error: 'Seed not found or invalid' });
+        } else {
+            // Peer or gateway failure: not an answer, so callers mustn't treat it as "not on chain"
+            res.status(500).json({ error: error.message });
+        }
     }
 });
 
+// GetSeedRecord throws "Seed <id> does not exist" for a missing record; anything else is a failure
+function isNotFound(error) {
+    return /does not exist/.test(error.message || '');
+}
+
+// Get many seed records in one request (bulk verification)
+app.post('/verify/batch', async (req, res) => {
+    const seedIds = req.body.seedIds || [];
+    console.log(`[VERIFY BATCH] Querying blockchain for ${seedIds.length} seeds`);
+
+    const settled = await Promise.allSettled(seedIds.map(async (seedId) => {
+        const resultBytes = await contract.evaluateTransaction('GetSeedRecord', seedId);
+        return JSON.parse(Buffer.from(resultBytes).toString('utf8'));
+    }));
+
+    const failed = settled.find(o => o.status === 'rejected' && !isNotFound(o.reason));
+    if (failed) {
+        console.error('[VERIFY BATCH] ERROR:', failed.reason.message);
+        return res.status(500).json({ error: failed.reason.message });
+    }
+
+    const records = {};
+    settled.forEach((outcome, i) => {
+        records[seedIds[i]] = outcome.status === 'fulfilled' ? outcome.value : null;
+    });
+
+    console.log(`[VERIFY BATCH] ${settled.filter(o => o.status === 'fulfilled').length}/${seedIds.length} found`);
+    res.json({ records });
+});
+
 // Health check
 app.get('/health', (req, res) => {
     res.json({ status: 'ok', blockchain: 'fabric' });
@@ -1,12 +1,13 @@
 import hashlib
 import json
 import logging
-from ecdsa import VerifyingKey, SECP256k1, BadSignatureError
 
 from sawtooth_sdk.processor.handler import TransactionHandler
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 from sawtooth_sdk.processor.core import TransactionProcessor
 
+from signatures import verify_signature
+
 LOGGER = logging.getLogger(__name__)
 
 # Family configuration
@@ -83,16 +84,9 @@ class SeedTransactionHandler(TransactionHandler):
 
         # Verify ECDSA signature if provided
         if signature_hex and public_key_hex:
-            try:
-                public_key = VerifyingKey.from_string(bytes.fromhex(public_key_hex), curve=SECP256k1)
-                signature_bytes = bytes.fromhex(signature_hex)
-                hash_bytes = bytes.fromhex(hash_value)
-
-                # Verify signature
-                public_key.verify(signature_bytes, hash_bytes)
-                LOGGER.info(f"ECDSA signature verified for seed {seed_id}")
-            except (BadSignatureError, ValueError) as e:
-                raise InvalidTransaction(f"Invalid ECDSA signature: {str(e)}")
+            if not verify_signature(hash_value, signature_hex, public_key_hex):
+                raise InvalidTransaction(f"Invalid ECDSA signature for seed {seed_id}")
+            LOGGER.info(f"ECDSA signature verified for seed {seed_id}")
         else:
             LOGGER.warning(f"No ECDSA signature provided for seed {seed_id}")
 
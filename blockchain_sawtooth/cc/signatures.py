@@ -0,0 +1,112 @@
+import hashlib
+import logging
+from functools import lru_cache
+
+LOGGER = logging.getLogger(__name__)
+
+# Verification of the seed records' SECP256k1 signatures: 64-byte r||s over
+# the SHA-1 digest of the seed hash, 64-byte X||Y public keys (the format the
+# ecdsa package produces). Uses coincurve (libsecp256k1) when installed,
+# then cryptography, then pure-Python ecdsa.
+
+# SECP256k1 group order
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+
+def _split_signature(signature):
+    if len(signature) != 64:
+        raise ValueError("Signature must be 64 bytes (r||s)")
+    return int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:], "big")
+
+
+def _coincurve_backend():
+    import coincurve
+    from coincurve.ecdsa import cdata_to_der, deserialize_compact
+
+    def hasher(message):
+        # libsecp256k1 takes a 32-byte integer; left-padding the SHA-1 digest keeps its value
+        return bytes(12) + hashlib.sha1(message).digest()
+
+    def load_public_key(public_key_bytes):
+        return coincurve.PublicKey(b"\x04" + public_key_bytes)
+
+    def verify(public_key, signature, message):
+        r, s = _split_signature(signature)
+        # libsecp256k1 only accepts low-S signatures; ecdsa makes either kind
+        if s > CURVE_ORDER // 2:
+            s = CURVE_ORDER - s
+        der = cdata_to_der(deserialize_compact(r.to_bytes(32, "big") + s.to_bytes(32, "big")))
+        return bool(public_key.verify(der, message, hasher=hasher))
+
+    return "coincurve", load_public_key, verify
+
+
+def _cryptography_backend():
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, utils
+
+    algorithm = ec.ECDSA(utils.Prehashed(hashes.SHA1()))
+
+    def load_public_key(public_key_bytes):
+        return ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), b"\x04" + public_key_bytes)
+
+    def verify(public_key, signature, message):
+        r, s = _split_signature(signature)
+        try:
+            public_key.verify(utils.encode_dss_signature(r, s), hashlib.sha1(message).digest(), algorithm)
+            return True
+        except InvalidSignature:
+            return False
+
+    return "cryptography", load_public_key, verify
+
+
+def _ecdsa_backend():
+    from ecdsa import VerifyingKey, SECP256k1, BadSignatureError
+
+    def load_public_key(public_key_bytes):
+        return VerifyingKey.from_string(public_key_bytes, curve=SECP256k1)
+
+    def verify(public_key, signature, message):
+        try:
+            return public_key.verify(signature, message)
+        except BadSignatureError:
+            return False
+
+    return "ecdsa", load_public_key, verify
+
+
+def _select_backend():
+    for backend in (_coincurve_backend, _cryptography_backend, _ecdsa_backend):
+        try:
+            return backend()
+        except ImportError:
+            continue
+    raise ImportError("No ECDSA library installed (coincurve, cryptography or ecdsa)")
+
+
+BACKEND_NAME, _load_public_key, _verify = _select_backend()
+LOGGER.info(f"ECDSA backend: {BACKEND_NAME}")
+
+
+@lru_cache(maxsize=256)
+def _public_key(public_key_hex):
+    # A handful of signers sign everything, so parsed keys are kept across transactions
+    return _load_public_key(bytes.fromhex(public_key_hex))
+
+
+def verify_signatures(batch):
+    """Check many (hash_hex, signature_hex, public_key_hex) triples; returns one bool each"""
+    results = []
+    for hash_hex, signature_hex, public_key_hex in batch:
+        try:
+            results.append(_verify(_public_key(public_key_hex), bytes.fromhex(signature_hex), bytes.fromhex(hash_hex)))
+        except Exception:
+            # Malformed hex, key or signature
+            results.append(False)
+    return results
+
+
+def verify_signature(hash_hex, signature_hex, public_key_hex):
+    return verify_signatures([(hash_hex, signature_hex, public_key_hex)])[0]
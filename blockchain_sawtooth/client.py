@@ -1,9 +1,10 @@
 import hashlib
 import json
-import time
 import base64
-import requests
+import httpx
 import os
+import asyncio
+from typing import List
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
@@ -21,10 +22,18 @@ from sawtooth_sdk.protobuf.batch_pb2 import BatchList, BatchHeader, Batch
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize on startup"""
+    global http
     init_signer()
 
+    # One pooled keep-alive connection set to the REST API for the whole process
+    http = httpx.AsyncClient(
+        base_url=VALIDATOR_URL,
+        timeout=VALIDATOR_TIMEOUT,
+        limits=httpx.Limits(max_connections=VALIDATOR_MAX_CONNECTIONS, max_keepalive_connections=VALIDATOR_MAX_CONNECTIONS),
+    )
+
     try:
-        response = requests.get(f"{VALIDATOR_URL}/batches")
+        response = await http.get("/batches")
         log(f"Connected to Sawtooth validator at {VALIDATOR_URL}")
     except Exception as e:
         log(f"Warning: Could not connect to validator: {e}")
@@ -32,6 +41,8 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    await http.aclose()
+
 
 app = FastAPI(lifespan=lifespan)
 
@@ -41,6 +52,21 @@ FAMILY_NAME = 'seed'
 FAMILY_VERSION = '1.0'
 NAMESPACE = hashlib.sha512(FAMILY_NAME.encode()).hexdigest()[:6]
 
+# Concurrent certify requests are coalesced into one BatchList
+CERTIFY_WINDOW_MS = int(os.getenv('CERTIFY_WINDOW_MS', '50'))
+CERTIFY_MAX_BATCHES = int(os.getenv('CERTIFY_MAX_BATCHES', '100'))
+
+# Max seconds one batch_statuses long-poll is held open by the REST API
+COMMIT_POLL_WAIT = int(os.getenv('COMMIT_POLL_WAIT', '10'))
+
+# Shared async HTTP client for the REST API (created in lifespan)
+VALIDATOR_TIMEOUT = float(os.getenv('VALIDATOR_TIMEOUT', '10'))
+VALIDATOR_MAX_CONNECTIONS = int(os.getenv('VALIDATOR_MAX_CONNECTIONS', '50'))
+http = None
+
+# Max state reads /verify/batch keeps in flight at once
+STATE_READ_CONCURRENCY = int(os.getenv('STATE_READ_CONCURRENCY', '20'))
+
 # Global signer
 context = None
 signer = None
@@ -118,64 +144,102 @@ def _create_batch(transactions):
     return batch
 
 
-def _send_to_validator(batch):
-    """Send batch to validator and return batch ID"""
+async def _send_to_validator(batches):
+    """Send batches to validator in one BatchList and return their batch IDs"""
 
-    batch_list = BatchList(batches=[batch])
+    batch_list = BatchList(batches=batches)
     batch_bytes = batch_list.SerializeToString()
 
-    response = requests.post(
-        f"{VALIDATOR_URL}/batches",
-        data=batch_bytes,
+    response = await http.post(
+        "/batches",
+        content=batch_bytes,
         headers={'Content-Type': 'application/octet-stream'}
     )
 
     if response.status_code not in (200, 201, 202):
         raise Exception(f"Failed to submit batch: {response.text}")
 
-    return batch.header_signature
+    return [batch.header_signature for batch in batches]
 
 
-def _wait_for_commit(batch_id, timeout=60):
-    """Wait for batch to be committed"""
+async def _fetch_batch_statuses(batch_ids, wait):
+    """Long-poll the REST API: returns once all batches are final or `wait` seconds pass"""
 
-    start_time = time.time()
+    response = await http.post(
+        "/batch_statuses",
+        params={'wait': wait},
+        json=batch_ids,
+        timeout=wait + 5
+    )
 
-    while time.time() - start_time < timeout:
-        try:
-            response = requests.get(
-                f"{VALIDATOR_URL}/batch_statuses?id={batch_id}",
-                timeout=5
-            )
-
-            if response.status_code != 200:
-                log(f"Batch status check failed: {response.text}")
-                time.sleep(2)
-                continue
-
-            data = response.json()
-            status = data['data'][0]['status']
-
-            log(f"Batch {batch_id[:16]}... status: {status}")
-
-            if status == 'COMMITTED':
-                return True
-            elif status == 'INVALID':
-                log(f"ERROR: Batch {batch_id[:16]}... is INVALID")
-                raise Exception(f"Transaction rejected: Invalid ECDSA signature or transaction data")
-
-            time.sleep(2)
-        except requests.exceptions.Timeout:
-            log(f"Batch status check timed out, retrying...")
-            time.sleep(2)
-            continue
-        except requests.exceptions.RequestException as e:
-            log(f"Network error checking batch status: {e}")
-            time.sleep(2)
-            continue
+    if response.status_code != 200:
+        raise Exception(f"Batch status check failed: {response.text}")
+
+    return {entry['id']: entry['status'] for entry in response.json()['data']}
+
+
+class CommitWatcher:
+    """One shared long-poll loop that tracks every pending batch id.
+
+    Callers await wait(); each poll checks all outstanding batches in a
+    single request and resolves every caller whose batches are final.
+    """
+
+    def __init__(self, poll_wait):
+        self.poll_wait = poll_wait
+        self.waiters = []  # [batch_ids, statuses, deadline, future]
+        self.task = None
+
+    async def wait(self, batch_ids, timeout=60):
+        """Wait for batches to be committed; returns {batch_id: status}"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        statuses = {batch_id: 'PENDING' for batch_id in batch_ids}
+        self.waiters.append([batch_ids, statuses, loop.time() + timeout, future])
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while self.waiters:
+            pending = sorted({
+                batch_id
+                for _, statuses, _, _ in self.waiters
+                for batch_id, status in statuses.items()
+                if status in ('PENDING', 'UNKNOWN')
+            })
+            # Don't hold a waiter past its deadline
+            wait = max(1, min(self.poll_wait, int(min(w[2] for w in self.waiters) - loop.time())))
+
+            try:
+                latest = await _fetch_batch_statuses(pending, wait) if pending else {}
+            except Exception as e:
+                log(f"Network error checking batch status: {e}")
+                latest = {}
+                await asyncio.sleep(1)
+
+            now = loop.time()
+            for waiter in list(self.waiters):
+                batch_ids, statuses, deadline, future = waiter
+                for batch_id in batch_ids:
+                    if batch_id in latest:
+                        statuses[batch_id] = latest[batch_id]
+                        if latest[batch_id] == 'INVALID':
+                            log(f"ERROR: Batch {batch_id[:16]}... is INVALID")
+
+                done = all(status not in ('PENDING', 'UNKNOWN') for status in statuses.values())
+                if done or now >= deadline:
+                    if not done:
+                        log(f"WARNING: Timeout waiting for {len(batch_ids)} batches")
+                    if not future.done():
+                        future.set_result(statuses)
 
-    log(f"WARNING: Timeout waiting for batch {batch_id[:16]}...")
-    return False
+            # Waiters added while the poll was in flight are kept for the next round
+            self.waiters = [waiter for waiter in self.waiters if not waiter[3].done()]
 
 
 # Pydantic models
@@ -188,14 +252,19 @@ class CertifyRequest(BaseModel):
     publicKey: str = ""
 
 
-@app.post('/certify')
-async def certify(data: CertifyRequest):
-    """Create seed record (certification)"""
-    try:
-        log(f"CERTIFY: Received request for seedId: {data.seedId}")
-        log(f"CERTIFY: className: {data.className}, hash: {data.hash[:16] if data.hash else None}...")
+class CertifyBatchRequest(BaseModel):
+    records: List[CertifyRequest]
 
-        # Create payload
+
+def _build_batches(records):
+    """Build one single-transaction batch per record, ready to send as one BatchList.
+
+    Each seed gets its own batch because Sawtooth batches are atomic: one
+    rejected seed (e.g. already certified) must not invalidate the others.
+    """
+    txns = []
+    batches = []
+    for data in records:
         payload = json.dumps({
             'action': 'create',
             'seedId': data.seedId,
@@ -205,22 +274,117 @@ async def certify(data: CertifyRequest):
             'signature': data.signature,
             'publicKey': data.publicKey
         })
-
-        # Get address
         address = _get_address(data.seedId)
 
-        # Create transaction and batch
         txn = _create_transaction(payload, [address], [address])
-        batch = _create_batch([txn])
+        txns.append(txn)
+        batches.append(_create_batch([txn]))
+
+    return txns, batches
+
+
+def _collect_results(records, txns, batch_ids, statuses):
+    """Build the per-seed certify response from final batch statuses"""
+    results = []
+    for data, txn, batch_id in zip(records, txns, batch_ids):
+        status = statuses.get(batch_id)
+        if status == 'INVALID':
+            results.append({
+                "seedId": data.seedId,
+                "success": False,
+                "error": "Transaction rejected: Invalid ECDSA signature or transaction data"
+            })
+            continue
+
+        committed = status == 'COMMITTED'
+        results.append({
+            "seedId": data.seedId,
+            "success": True,
+            "transactionId": txn.header_signature,
+            "committed": committed,
+        })
+
+    return results
+
+
+class CertifyAggregator:
+    """Coalesces concurrent certify requests into a single BatchList.
+
+    Records are collected for up to window_ms (or until max_batches are
+    waiting), then submitted together; each caller gets its own results.
+    """
+
+    def __init__(self, window_ms, max_batches):
+        self.window = window_ms / 1000
+        self.max_batches = max_batches
+        self.pending = []
+        self.timer = None
+        self.tasks = set()
+
+    async def submit(self, records):
+        loop = asyncio.get_running_loop()
+        futures = []
+        for record in records:
+            future = loop.create_future()
+            self.pending.append((record, future))
+            futures.append(future)
 
-        # Send to validator
-        batch_id = _send_to_validator(batch)
+        if len(self.pending) >= self.max_batches:
+            self._flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.window, self._flush)
 
-        # Wait for commit
-        committed = _wait_for_commit(batch_id)
+        return await asyncio.gather(*futures)
 
+    def _flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        pending, self.pending = self.pending, []
+        for start in range(0, len(pending), self.max_batches):
+            task = asyncio.create_task(self._submit(pending[start:start + self.max_batches]))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _submit(self, pending):
+        log(f"CERTIFY: Submitting {len(pending)} records in one BatchList")
+        try:
+            records = [record for record, _ in pending]
+            txns, batches = _build_batches(records)
+            batch_ids = await _send_to_validator(batches)
+            statuses = await commit_watcher.wait(batch_ids)
+            results = _collect_results(records, txns, batch_ids, statuses)
+        except Exception as error:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+commit_watcher = CommitWatcher(COMMIT_POLL_WAIT)
+aggregator = CertifyAggregator(CERTIFY_WINDOW_MS, CERTIFY_MAX_BATCHES)
+
+
+@app.post('/certify')
+async def certify(data: CertifyRequest):
+    """Create seed record (certification)"""
+    try:
+        log(f"CERTIFY: Received request for seedId: {data.seedId}")
+        log(f"CERTIFY: className: {data.className}, hash: {data.hash[:16] if data.hash else None}...")
+
+        [result] = await aggregator.submit([data])
+
+        if not result["success"]:
+            raise Exception(result["error"])
+
+        committed = result["committed"]
         if committed:
-            log(f"CERTIFY SUCCESS: seedId: {data.seedId}, txId: {txn.header_signature[:16]}...")
+            log(f"CERTIFY SUCCESS: seedId: {data.seedId}, txId: {result['transactionId'][:16]}...")
         else:
             log(f"CERTIFY WARNING: Batch submitted but confirmation timed out for seedId: {data.seedId}")
 
@@ -228,7 +392,7 @@ async def certify(data: CertifyRequest):
             "success": True,
             "message": "Seed certified on blockchain" if committed else "Seed certification submitted (confirmation pending)",
             "seedId": data.seedId,
-            "transactionId": txn.header_signature,
+            "transactionId": result["transactionId"],
             "committed": committed,
             "type": "sawtooth"
         }
@@ -238,6 +402,23 @@ async def certify(data: CertifyRequest):
         raise HTTPException(status_code=500, detail=str(error))
 
 
+@app.post('/certify/batch')
+async def certify_batch(data: CertifyBatchRequest):
+    """Create many seed records in one request; returns a result per seed"""
+    try:
+        log(f"CERTIFY BATCH: Received {len(data.records)} records")
+
+        results = await aggregator.submit(data.records)
+
+        log(f"CERTIFY BATCH: {sum(r['success'] for r in results)}/{len(results)} accepted")
+
+        return {"results": results, "type": "sawtooth"}
+
+    except Exception as error:
+        log(f"CERTIFY BATCH ERROR: {str(error)}")
+        raise HTTPException(status_code=500, detail=str(error))
+
+
 @app.get('/verify/{seed_id}')
 async def verify(seed_id: str):
     """Get seed record (verification)"""
@@ -248,7 +429,7 @@ async def verify(seed_id: str):
         address = _get_address(seed_id)
 
         # Query state
-        response = requests.get(f"{VALIDATOR_URL}/state/{address}")
+        response = await http.get(f"/state/{address}")
 
         if response.status_code == 404:
             log(f"VERIFY ERROR: seedId {seed_id} not found")
@@ -258,10 +439,7 @@ async def verify(seed_id: str):
             raise Exception(f"Failed to get state: {response.text}")
 
         # Decode data
-        data = response.json()
-        record_b64 = data['data']
-        record_bytes = base64.b64decode(record_b64)
-        record = json.loads(record_bytes.decode())
+        record = _decode_record(response.json()['data'])
 
         log(f"VERIFY SUCCESS: Found record for seedId: {seed_id}, hash: {record.get('hash', '')[:16]}...")
 
@@ -270,8 +448,58 @@ async def verify(seed_id: str):
     except HTTPException:
         raise
     except Exception as error:
+        # Validator failure, not a missing record: callers mustn't read it as "not on chain"
         log(f"VERIFY ERROR for seedId {seed_id}: {str(error)}")
-        raise HTTPException(status_code=404, detail='Seed not found or invalid')
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+class VerifyBatchRequest(BaseModel):
+    seedIds: List[str]
+
+
+def _decode_record(record_b64):
+    """Decode a base64 state entry into the seed record dict"""
+    return json.loads(base64.b64decode(record_b64).decode())
+
+
+async def _get_state(address):
+    """Fetch one state entry (base64), or None if the address is empty"""
+    response = await http.get(f"/state/{address}")
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise Exception(f"Failed to get state: {response.text}")
+    return response.json()['data']
+
+
+@app.post('/verify/batch')
+async def verify_batch(data: VerifyBatchRequest):
+    """Get many seed records at once; returns {seedId: record or null}"""
+    try:
+        seed_ids = list(dict.fromkeys(data.seedIds))
+        log(f"VERIFY BATCH: Querying blockchain for {len(seed_ids)} seeds")
+
+        addresses = {seed_id: _get_address(seed_id) for seed_id in seed_ids}
+
+        # One point read per seed, so the cost follows the tray size, not the chain size
+        slots = asyncio.Semaphore(STATE_READ_CONCURRENCY)
+
+        async def read(address):
+            async with slots:
+                return await _get_state(address)
+
+        values = await asyncio.gather(*(read(address) for address in addresses.values()))
+        raw = dict(zip(addresses, values))
+
+        records = {seed_id: _decode_record(value) if value else None for seed_id, value in raw.items()}
+
+        log(f"VERIFY BATCH SUCCESS: {sum(r is not None for r in records.values())}/{len(records)} found")
+
+        return {"records": records}
+
+    except Exception as error:
+        log(f"VERIFY BATCH ERROR: {str(error)}")
+        raise HTTPException(status_code=500, detail=str(error))
 
 
 @app.get('/health')
@@ -0,0 +1,26 @@
+'use client';
+
+export default function LoadMoreButton({ loaded, total, hasMore, loadingMore, onLoadMore }) {
+  return (
+    <div style={{ display: 'flex', justifyContent: 'center', alignItems: 'center', gap: '1rem', marginTop: '1.5rem' }}>
+      <span style={{ color: '#aaa' }}>
+        {total != null ? `Loaded ${loaded} of ${total} records` : `Loaded ${loaded} records`}
+      </span>
+      {hasMore && (
+        <button
+          onClick={onLoadMore}
+          disabled={loadingMore}
+          style={{
+            padding: '0.5rem 1rem',
+            background: '#2a2a2a',
+            border: '1px solid #333',
+            color: loadingMore ? '#555' : '#e0e0e0',
+            cursor: loadingMore ? 'not-allowed' : 'pointer'
+          }}
+        >
+          {loadingMore ? 'Loading...' : 'Load more'}
+        </button>
+      )}
+    </div>
+  );
+}
@@ -3,8 +3,15 @@ import { useState } from 'react';
 import axios from 'axios';
 import { API_URL } from '../../../../lib/config';
 import { getConfidenceColor } from '../../utils/helpers';
+import LoadMoreButton from '../LoadMoreButton';
 
-export default function CertifyTab({ records, certifiers, loadingRecords, refreshRecords, onRecordClick }) {
+// How long the queue waits on one certification job before moving on
+const JOB_MAX_WAIT_MS = 120000;
+const JOB_POLL_INTERVAL_MS = 2000;
+// Consecutive failed status polls tolerated before giving up on a job
+const JOB_POLL_MAX_ERRORS = 3;
+
+export default function CertifyTab({ records, stats, certifiers, loadingRecords, hasMore, loadingMore, onLoadMore, refreshRecords, onRecordClick }) {
   const [selectedCertifier, setSelectedCertifier] = useState('');
   const [selectedBlockchain, setSelectedBlockchain] = useState('fabric');
   const [certifyMessage, setCertifyMessage] = useState('');
@@ -40,6 +47,30 @@ export default function CertifyTab({ records, certifiers, loadingRecords, refres
     setTimeout(() => setCertifyMessage(''), 2000);
   };
 
+  // Certification runs as a background job; poll until it finishes. A job still
+  // queued/running after JOB_MAX_WAIT_MS (e.g. no worker up) comes back as
+  // 'pending': the worker will still certify it, the queue just stops waiting.
+  const waitForCertifyJob = async (jobId) => {
+    const deadline = Date.now() + JOB_MAX_WAIT_MS;
+    let errors = 0;
+    while (Date.now() < deadline) {
+      try {
+        const res = await axios.get(`${API_URL}/api/certify/${jobId}/`);
+        errors = 0;
+        if (res.data.status === 'succeeded' || res.data.status === 'failed') {
+          return res.data;
+        }
+      } catch (err) {
+        // Transient poll errors are retried; the job itself is unaffected
+        errors += 1;
+        console.error(`Polling certification job ${jobId} failed:`, err);
+        if (errors >= JOB_POLL_MAX_ERRORS) break;
+      }
+      await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+    return { id: jobId, status: 'pending' };
+  };
+
   const processCertifyQueue = async () => {
     if (queueProcessing || certifyQueue.length === 0) return;
 
@@ -64,18 +95,26 @@ export default function CertifyTab({ records, certifiers, loadingRecords, refres
         formData.append('signer_id', item.certifier);
 
         const res = await axios.post(`${API_URL}/api/certify/`, formData);
+        const job = await waitForCertifyJob(res.data.job_id);
 
-        if (res.data.success) {
+        if (job.status === 'succeeded') {
           setCertifyQueue(prev => {
             const updated = [...prev];
             updated[i] = { ...updated[i], status: 'completed' };
             return updated;
           });
           setCertifyMessage(`Seed #${item.id} certified successfully!`);
+        } else if (job.status === 'pending') {
+          setCertifyQueue(prev => {
+            const updated = [...prev];
+            updated[i] = { ...updated[i], status: 'pending' };
+            return updated;
+          });
+          setCertifyMessage(`Seed #${item.id} is still being certified in the background`);
         } else {
           setCertifyQueue(prev => {
             const updated = [...prev];
-            updated[i] = { ...updated[i], status: 'failed' };
+            updated[i] = { ...updated[i], status: 'failed', error: job.error };
             return updated;
           });
         }
@@ -93,7 +132,7 @@ export default function CertifyTab({ records, certifiers, loadingRecords, refres
     }
 
     await refreshRecords();
-    setCertifyQueue(prev => prev.filter(item => item.status === 'failed'));
+    setCertifyQueue(prev => prev.filter(item => item.status === 'failed' || item.status === 'pending'));
     setQueuedItems(new Set());
     setQueueProcessing(false);
     setCertifyMessage('Queue processing complete!');
@@ -217,7 +256,8 @@ export default function CertifyTab({ records, certifiers, loadingRecords, refres
                     padding: '0.25rem 0.5rem',
                     background: item.status === 'processing' ? '#4a90e2' :
                                 item.status === 'completed' ? '#4caf50' :
-                                item.status === 'failed' ? '#ff6b6b' : '#555',
+                                item.status === 'failed' ? '#ff6b6b' :
+                                item.status === 'pending' ? '#ff9800' : '#555',
                     borderRadius: '3px',
                     marginTop: '0.5rem'
                   }}>
@@ -299,6 +339,14 @@ export default function CertifyTab({ records, certifiers, loadingRecords, refres
               ))}
             </tbody>
           </table>
+
+          <LoadMoreButton
+            loaded={records.length}
+            total={stats?.total}
+            hasMore={hasMore}
+            loadingMore={loadingMore}
+            onLoadMore={onLoadMore}
+          />
         </>
       )}
     </div>
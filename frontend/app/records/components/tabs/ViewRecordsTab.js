@@ -2,8 +2,9 @@
 import { useState } from 'react';
 import { API_URL } from '../../../../lib/config';
 import { formatDate, getConfidenceColor } from '../../utils/helpers';
+import LoadMoreButton from '../LoadMoreButton';
 
-export default function ViewRecordsTab({ records, loadingRecords, onRecordClick }) {
+export default function ViewRecordsTab({ records, stats, loadingRecords, hasMore, loadingMore, onLoadMore, onRecordClick }) {
   const [viewMode, setViewMode] = useState('cards');
   const [currentPage, setCurrentPage] = useState(1);
   const [itemsPerPage, setItemsPerPage] = useState(5);
@@ -205,6 +206,14 @@ export default function ViewRecordsTab({ records, loadingRecords, onRecordClick
               Next
             </button>
           </div>
+
+          <LoadMoreButton
+            loaded={records.length}
+            total={stats?.total}
+            hasMore={hasMore}
+            loadingMore={loadingMore}
+            onLoadMore={onLoadMore}
+          />
         </>
       )}
     </div>
@@ -2,30 +2,55 @@ import { useState, useEffect } from 'react';
 import axios from 'axios';
 import { API_URL } from '../../../lib/config';
 
+const PAGE_SIZE = 100;
+
+// One page of /api/database/; pass the previous page's next_cursor for the next one
+async function fetchRecordsPage(cursor) {
+  const params = { limit: PAGE_SIZE };
+  if (cursor) params.cursor = cursor;
+  const res = await axios.get(`${API_URL}/api/database/`, { params });
+  return {
+    records: res.data.records.map(r => ({
+      id: r.id,
+      prediction: r.prediction,
+      confidence: r.confidence,
+      quality: r.quality,
+      blockchain_status: r.blockchain_synced ? 'Certified' : 'Not Certified',
+      blockchain_type: r.blockchain_type,
+      certifier: r.signer_name,
+      tx_id: r.blockchain_tx_id,
+      created_at: r.uploaded_at,
+      image_url: r.image_url
+    })),
+    nextCursor: res.data.next_cursor
+  };
+}
+
 export function useRecords() {
   const [records, setRecords] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [stats, setStats] = useState(null);
   const [certifiers, setCertifiers] = useState([]);
   const [loadingRecords, setLoadingRecords] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // Replace whatever is loaded with the newest page and fresh totals
+  const loadFirstPage = async () => {
+    const [page, statsRes] = await Promise.all([
+      fetchRecordsPage(null),
+      axios.get(`${API_URL}/api/stats/`)
+    ]);
+    setRecords(page.records);
+    setNextCursor(page.nextCursor);
+    setStats(statsRes.data);
+  };
 
   const fetchData = async () => {
     try {
       setLoadingRecords(true);
 
       // Fetch records
-      const recordsRes = await axios.get(`${API_URL}/api/database/`);
-      const recordsData = recordsRes.data.records.map(r => ({
-        id: r.id,
-        prediction: r.prediction,
-        confidence: r.confidence,
-        quality: r.quality,
-        blockchain_status: r.blockchain_synced ? 'Certified' : 'Not Certified',
-        blockchain_type: r.blockchain_type,
-        certifier: r.signer_name,
-        tx_id: r.blockchain_tx_id,
-        created_at: r.uploaded_at,
-        image_url: r.image_url
-      }));
-      setRecords(recordsData);
+      await loadFirstPage();
 
       // Fetch certifiers
       const certifiersRes = await axios.get(`${API_URL}/api/signers/`);
@@ -39,33 +64,38 @@ export function useRecords() {
 
   const refreshRecords = async () => {
     try {
-      const recordsRes = await axios.get(`${API_URL}/api/database/`);
-      const recordsData = recordsRes.data.records.map(r => ({
-        id: r.id,
-        prediction: r.prediction,
-        confidence: r.confidence,
-        quality: r.quality,
-        blockchain_status: r.blockchain_synced ? 'Certified' : 'Not Certified',
-        blockchain_type: r.blockchain_type,
-        certifier: r.signer_name,
-        tx_id: r.blockchain_tx_id,
-        created_at: r.uploaded_at,
-        image_url: r.image_url
-      }));
-      setRecords(recordsData);
+      await loadFirstPage();
     } catch (error) {
       console.error('Error refreshing records:', error);
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchRecordsPage(nextCursor);
+      setRecords(prev => [...prev, ...page.records]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more records:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchData();
   }, []);
 
   return {
     records,
+    stats,
     certifiers,
     loadingRecords,
+    loadingMore,
+    hasMore: Boolean(nextCursor),
+    loadMore,
     refreshRecords
   };
 }
@@ -12,7 +12,7 @@ import VerifyDetailModal from './components/modals/VerifyDetailModal';
 
 export default function RecordsPage() {
   const [activeTab, setActiveTab] = useState('upload');
-  const { records, certifiers, loadingRecords, refreshRecords } = useRecords();
+  const { records, stats, certifiers, loadingRecords, loadingMore, hasMore, loadMore, refreshRecords } = useRecords();
 
   // Modal states
   const [selectedRecord, setSelectedRecord] = useState(null);
@@ -60,7 +60,11 @@ export default function RecordsPage() {
       {activeTab === 'view' && (
         <ViewRecordsTab
           records={records}
+          stats={stats}
           loadingRecords={loadingRecords}
+          hasMore={hasMore}
+          loadingMore={loadingMore}
+          onLoadMore={loadMore}
           onRecordClick={setSelectedRecord}
         />
       )}
@@ -68,8 +72,12 @@ export default function RecordsPage() {
       {activeTab === 'certify' && (
         <CertifyTab
           records={records}
+          stats={stats}
           certifiers={certifiers}
           loadingRecords={loadingRecords}
+          hasMore={hasMore}
+          loadingMore={loadingMore}
+          onLoadMore={loadMore}
           refreshRecords={refreshRecords}
           onRecordClick={setSelectedRecord}
         />
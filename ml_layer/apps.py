@@ -5,3 +5,10 @@ class MlLayerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ml_layer"
 
+    def ready(self):
+        from . import signals  # noqa: F401
+        from . import embedding_cache
+
+        # Warm the in-memory embedding index in the background
+        if embedding_cache.EMBEDDING_CACHE_ENABLED:
+            embedding_cache.index.build_async()
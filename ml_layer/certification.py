@@ -0,0 +1,332 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timezone, timedelta
+from django.db import transaction
+from django.db.models import Q
+
+from .models import SeedImage, CertificationJob
+from . import feature_hasher
+from . import chain_cache
+from . import outbound
+from . import stats
+
+BLOCKCHAIN_TYPE = {
+    "fabric": os.getenv("FABRIC_URL", "http://localhost:3000"),
+    "sawtooth": os.getenv("SAWTOOTH_URL", "http://localhost:9000")
+}
+
+# Chain clients wait for block commit before answering
+CERTIFY_TIMEOUT = 70
+
+# Chains whose records keep the signer's signature and public key
+# (Fabric's CreateSeedRecord stores only the hash)
+CHAINS_STORING_SIGNATURES = {"sawtooth"}
+
+# Max seeds a worker sends to a chain in one batch
+CERTIFY_BATCH_SIZE = int(os.getenv("CERTIFY_BATCH_SIZE", "100"))
+
+# A running job is reclaimed after this long without a heartbeat. Workers beat
+# before every chain request, so it must outlast one request and its retries.
+CERTIFY_STALE_AFTER = int(
+    os.getenv("CERTIFY_STALE_AFTER", str(2 * CERTIFY_TIMEOUT * (outbound.OUTBOUND_RETRIES + 1)))
+)
+
+
+class CertificationError(Exception):
+    """Raised when no blockchain accepted the certification"""
+
+
+def compute_seed_hash(embedding, confidence, quality):
+    """Compute SHA256 hash of seed data for blockchain"""
+    # Handle numpy arrays
+    if hasattr(embedding, 'tolist'):
+        embedding = embedding.tolist()
+    elif embedding is None:
+        embedding = []
+
+    data = {
+        "embedding": embedding,
+        "confidence": confidence,
+        "quality": quality
+    }
+    return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+
+
+def build_certification_payloads(seeds, signer_id):
+    """Hash and sign a list of seed records with one signer. Raises ValueError for an unknown signer."""
+    seed_hashes = [compute_seed_hash(seed.embedding, seed.confidence, seed.quality) for seed in seeds]
+    signatures, public_key_hex, signer_name = feature_hasher.sign_hashes(seed_hashes, signer_id)
+    timestamp = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+    return [
+        {
+            "seedId": str(seed.id),
+            "className": seed.prediction,
+            "hash": seed_hash,
+            "timestamp": timestamp,
+            "signature": signature_hex,
+            "publicKey": public_key_hex,
+            "signerName": signer_name,
+        }
+        for seed, seed_hash, signature_hex in zip(seeds, seed_hashes, signatures)
+    ]
+
+
+def _already_on_chain(chain, payloads):
+    """Of payloads a chain rejected, those it already holds with the same hash.
+
+    A retried job (e.g. one reclaimed from a slow worker) is rejected by a
+    chain that refuses duplicates; the earlier write counts as success.
+    """
+    url = BLOCKCHAIN_TYPE[chain]
+    response = outbound.post(
+        f"{url}/verify/batch",
+        breaker_name=chain,
+        json={"seedIds": [payload["seedId"] for payload in payloads]},
+        timeout=CERTIFY_TIMEOUT,
+    )
+    if response.status_code != 200:
+        return {}
+
+    records = response.json().get("records", {})
+    existing = {}
+    for payload in payloads:
+        record = records.get(payload["seedId"])
+        if record and record.get("hash") == payload["hash"]:
+            existing[payload["seedId"]] = {
+                "seedId": payload["seedId"],
+                "transactionId": record.get("transactionId") or record.get("tx_id"),
+                "type": chain,
+                "committed": True,
+            }
+    return existing
+
+
+def _post_certifications(chain, payloads, heartbeat=None):
+    """Send payloads to one chain client; returns {seedId: tx_data} for the accepted ones"""
+    url = BLOCKCHAIN_TYPE[chain]
+    if heartbeat:
+        heartbeat()
+    response = outbound.post(
+        f"{url}/certify/batch", breaker_name=chain, json={"records": payloads}, timeout=CERTIFY_TIMEOUT
+    )
+
+    if response.status_code in (404, 405):
+        # Chain client without a batch endpoint: one request per record
+        accepted = {}
+        for payload in payloads:
+            if heartbeat:
+                heartbeat()
+            try:
+                single = outbound.post(f"{url}/certify", breaker_name=chain, json=payload, timeout=CERTIFY_TIMEOUT)
+                if single.status_code == 200:
+                    accepted[payload["seedId"]] = single.json()
+            except Exception as e:
+                # Keep the records already accepted; this one goes to the fallback chain
+                print(f"Blockchain {chain} failed for seed {payload['seedId']}: {e}")
+    elif response.status_code != 200:
+        raise CertificationError(f"HTTP {response.status_code}")
+    else:
+        data = response.json()
+        accepted = {
+            result["seedId"]: {**result, "type": result.get("type") or data.get("type")}
+            for result in data.get("results", [])
+            if result.get("success")
+        }
+
+    rejected = [payload for payload in payloads if payload["seedId"] not in accepted]
+    if rejected:
+        if heartbeat:
+            heartbeat()
+        try:
+            accepted.update(_already_on_chain(chain, rejected))
+        except Exception as e:
+            # Treat as nothing found so the accepted records aren't thrown away
+            print(f"Could not check {chain} for existing records: {e}")
+    return accepted
+
+
+def _chain_record(chain, payload, tx_id):
+    """The record a verify would read back from the chain for a payload it accepted"""
+    record = {
+        "seedId": payload["seedId"],
+        "className": payload["className"],
+        "hash": payload["hash"],
+        "timestamp": payload["timestamp"],
+        "signerName": payload["signerName"],
+        "tx_id": tx_id,
+        "transactionId": tx_id,
+    }
+    if chain in CHAINS_STORING_SIGNATURES:
+        record["signature"] = payload["signature"]
+        record["publicKey"] = payload["publicKey"]
+    return record
+
+
+def submit_certifications(seeds, blockchain_type, signer_id, heartbeat=None):
+    """Certify seeds on the preferred chain, sending the rest to the other chains.
+
+    Saves transactions on the certified seeds and returns {seed_id: error or None}.
+    heartbeat, if given, is called before every chain request.
+    """
+    payloads = {seed.id: payload for seed, payload in zip(seeds, build_certification_payloads(seeds, signer_id))}
+    pending = {seed.id: seed for seed in seeds}
+    certified = []
+    committed = {}
+    before = {seed.id: stats.snapshot(seed) for seed in seeds}
+
+    chains = [blockchain_type] if blockchain_type in BLOCKCHAIN_TYPE else []
+    chains += [key for key in BLOCKCHAIN_TYPE if key != blockchain_type]
+
+    for chain in chains:
+        if not pending:
+            break
+        try:
+            accepted = _post_certifications(chain, [payloads[seed_id] for seed_id in pending], heartbeat)
+        except Exception as e:
+            print(f"Blockchain {chain} failed: {e}, trying fallback")
+            continue
+
+        for seed_id in list(pending):
+            tx_data = accepted.get(str(seed_id))
+            if tx_data is None:
+                continue
+            seed = pending.pop(seed_id)
+            seed.blockchain_tx_id = tx_data.get("transactionId")
+            seed.blockchain_type = tx_data.get("type")
+            seed.signer_name = payloads[seed_id]["signerName"]
+            seed.certification_status = "certified"
+            certified.append(seed)
+            committed[seed.id] = tx_data.get("committed", True)
+
+        print(f"Certified {len(accepted)} seeds on blockchain ({chain})")
+        if pending:
+            print(f"{len(pending)} seeds not accepted by {chain}, trying fallback")
+
+    with transaction.atomic():
+        SeedImage.objects.bulk_update(
+            certified, ["blockchain_tx_id", "blockchain_type", "signer_name", "certification_status"]
+        )
+        stats.record_changes([(before[seed.id], stats.snapshot(seed)) for seed in certified])
+
+    # Seed the verify cache with what was just written
+    chain_cache.store({
+        (seed.blockchain_type, seed.id): _chain_record(seed.blockchain_type, payloads[seed.id], seed.blockchain_tx_id)
+        for seed in certified
+        if seed.blockchain_type in BLOCKCHAIN_TYPE and committed.get(seed.id, True)
+    })
+
+    results = {seed.id: None for seed in certified}
+    results.update({seed_id: "All blockchain certifications failed" for seed_id in pending})
+    return results
+
+
+def submit_certification(seed, blockchain_type, signer_id):
+    """Certify a single seed. Raises CertificationError if every chain fails."""
+    error = submit_certifications([seed], blockchain_type, signer_id)[seed.id]
+    if error:
+        raise CertificationError(error)
+    return seed
+
+
+# ============== Job queue ==============
+
+def enqueue_certifications(seeds, blockchain_type, signer_id):
+    """Queue certification jobs for seeds, reusing any that are already pending.
+
+    Returns one job per seed, in order.
+    """
+    with transaction.atomic():
+        pending = {
+            job.seed_id: job
+            for job in CertificationJob.objects.select_for_update().filter(
+                seed__in=seeds, status__in=["queued", "running"]
+            )
+        }
+        new_jobs = CertificationJob.objects.bulk_create([
+            CertificationJob(seed=seed, blockchain_type=blockchain_type, signer_id=signer_id)
+            for seed in seeds if seed.id not in pending
+        ])
+        pending.update({job.seed_id: job for job in new_jobs})
+        SeedImage.objects.filter(pk__in=[job.seed_id for job in new_jobs]).update(certification_status="queued")
+
+    return [pending[seed.id] for seed in seeds]
+
+
+def enqueue_certification(seed, blockchain_type, signer_id):
+    """Queue a certification job for a seed, reusing one that is already pending"""
+    return enqueue_certifications([seed], blockchain_type, signer_id)[0]
+
+
+def claim_jobs(limit=CERTIFY_BATCH_SIZE, stale_after=CERTIFY_STALE_AFTER):
+    """Atomically take the oldest claimable job plus up to limit-1 more for the same chain and signer.
+
+    Claimable jobs are queued ones, or running ones whose worker stopped
+    sending heartbeats (see run_jobs).
+    """
+    now = datetime.now(timezone.utc)
+    claimable = Q(status="queued") | Q(status="running", started_at__lt=now - timedelta(seconds=stale_after))
+
+    with transaction.atomic():
+        locked = CertificationJob.objects.select_for_update(skip_locked=True).filter(claimable).order_by("created_at")
+        first = locked.first()
+        if first is None:
+            return []
+
+        jobs = [first] + list(
+            locked.filter(blockchain_type=first.blockchain_type, signer_id=first.signer_id)
+            .exclude(pk=first.pk)[:limit - 1]
+        )
+        for job in jobs:
+            job.status = "running"
+            job.attempts += 1
+            job.started_at = now
+        CertificationJob.objects.bulk_update(jobs, ["status", "attempts", "started_at"])
+        SeedImage.objects.filter(pk__in=[job.seed_id for job in jobs]).update(certification_status="certifying")
+
+    return jobs
+
+
+def run_jobs(jobs):
+    """Submit claimed jobs (same chain and signer) as one batch and record each outcome"""
+    seeds_by_id = SeedImage.objects.in_bulk([job.seed_id for job in jobs])
+    seeds = [seeds_by_id[job.seed_id] for job in jobs]
+    job_ids = [job.id for job in jobs]
+
+    def heartbeat():
+        # Keeps claim_jobs from handing these jobs to another worker while the chains are slow
+        CertificationJob.objects.filter(pk__in=job_ids, status="running").update(
+            started_at=datetime.now(timezone.utc)
+        )
+
+    try:
+        results = submit_certifications(seeds, jobs[0].blockchain_type, jobs[0].signer_id, heartbeat)
+    except Exception as e:
+        results = {seed.id: str(e) for seed in seeds}
+
+    finished_at = datetime.now(timezone.utc)
+    for job, seed in zip(jobs, seeds):
+        error = results.get(seed.id)
+        job.status = "failed" if error else "succeeded"
+        job.error = error
+        job.blockchain_tx_id = None if error else seed.blockchain_tx_id
+        job.finished_at = finished_at
+
+    CertificationJob.objects.bulk_update(jobs, ["status", "blockchain_tx_id", "error", "finished_at"])
+    SeedImage.objects.filter(pk__in=[job.seed_id for job in jobs if job.error]).update(certification_status="failed")
+    return jobs
+
+
+def job_to_dict(job):
+    return {
+        "job_id": job.id,
+        "seed_id": job.seed_id,
+        "status": job.status,
+        "blockchain_type": job.blockchain_type,
+        "blockchain_tx_id": job.blockchain_tx_id,
+        "attempts": job.attempts,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
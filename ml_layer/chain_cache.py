@@ -0,0 +1,69 @@
+import os
+from datetime import datetime, timezone, timedelta
+from django.db.models import Q
+
+from .models import ChainRecord
+
+# How long a "not on chain" answer is trusted before asking the chain again
+CHAIN_CACHE_NEGATIVE_TTL = int(os.getenv("CHAIN_CACHE_NEGATIVE_TTL", "60"))
+
+# Sawtooth's seed processor rejects writes to an existing address, so its
+# records never change once found. Fabric's CreateSeedRecord overwrites, so
+# its records are re-read after CHAIN_CACHE_FOUND_TTL seconds.
+IMMUTABLE_CHAINS = {"sawtooth"}
+CHAIN_CACHE_FOUND_TTL = int(os.getenv("CHAIN_CACHE_FOUND_TTL", "300"))
+
+
+def get_cached(keys):
+    """Look up (chain, seed_id) keys; returns {key: record or None} for usable cache entries"""
+    if not keys:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    chains = {chain for chain, _ in keys}
+    seed_ids = {str(seed_id) for _, seed_id in keys}
+    wanted = {(chain, str(seed_id)): (chain, seed_id) for chain, seed_id in keys}
+
+    rows = ChainRecord.objects.filter(chain__in=chains, seed_id__in=seed_ids).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+    )
+
+    hits = {}
+    for row in rows:
+        key = wanted.get((row.chain, row.seed_id))
+        if key is not None:
+            hits[key] = row.record if row.found else None
+    return hits
+
+
+def store(records):
+    """Save {(chain, seed_id): record or None} answers read from the chains"""
+    if not records:
+        return
+
+    now = datetime.now(timezone.utc)
+
+    def expires_at(chain, record):
+        if record is None:
+            return now + timedelta(seconds=CHAIN_CACHE_NEGATIVE_TTL)
+        if chain in IMMUTABLE_CHAINS:
+            return None
+        return now + timedelta(seconds=CHAIN_CACHE_FOUND_TTL)
+
+    rows = [
+        ChainRecord(
+            chain=chain,
+            seed_id=str(seed_id),
+            transaction_id=(record.get("transactionId") or record.get("tx_id")) if record else None,
+            record=record,
+            found=record is not None,
+            expires_at=expires_at(chain, record),
+        )
+        for (chain, seed_id), record in records.items()
+    ]
+    ChainRecord.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["chain", "seed_id"],
+        update_fields=["transaction_id", "record", "found", "fetched_at", "expires_at"],
+    )
@@ -0,0 +1,193 @@
+import hashlib
+import os
+
+# SECP256k1 signing behind one interface, using the fastest library installed:
+# coincurve (libsecp256k1), then cryptography (OpenSSL), then pure-Python ecdsa.
+# ECDSA_BACKEND forces one of them by name.
+#
+# Every backend speaks the format the chains already hold, which is what the
+# ecdsa package produces by default: 32-byte private keys, 64-byte X||Y public
+# keys, 64-byte r||s signatures over the SHA-1 digest of the message.
+ECDSA_BACKEND = os.getenv("ECDSA_BACKEND")
+
+# SECP256k1 group order
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+
+def _digest(message):
+    return hashlib.sha1(message).digest()
+
+
+def _split_signature(signature):
+    if len(signature) != 64:
+        raise ValueError("Signature must be 64 bytes (r||s)")
+    return int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:], "big")
+
+
+class CoincurveBackend:
+    name = "coincurve"
+
+    def __init__(self):
+        import coincurve
+        from coincurve.ecdsa import cdata_to_der, der_to_cdata, deserialize_compact, serialize_compact
+
+        self.coincurve = coincurve
+        self.cdata_to_der = cdata_to_der
+        self.der_to_cdata = der_to_cdata
+        self.deserialize_compact = deserialize_compact
+        self.serialize_compact = serialize_compact
+
+    @staticmethod
+    def _hasher(message):
+        # libsecp256k1 takes a 32-byte integer; left-padding the SHA-1 digest keeps its value
+        return bytes(12) + _digest(message)
+
+    def generate(self):
+        return self.coincurve.PrivateKey().secret
+
+    def load_private_key(self, private_key_bytes):
+        return self.coincurve.PrivateKey(private_key_bytes)
+
+    def public_key_bytes(self, private_key):
+        return private_key.public_key.format(compressed=False)[1:]
+
+    def load_public_key(self, public_key_bytes):
+        return self.coincurve.PublicKey(b"\x04" + public_key_bytes)
+
+    def sign(self, private_key, message):
+        der = private_key.sign(message, hasher=self._hasher)
+        return self.serialize_compact(self.der_to_cdata(der))
+
+    def verify(self, public_key, signature, message):
+        r, s = _split_signature(signature)
+        # libsecp256k1 only accepts low-S signatures; ecdsa makes either kind
+        if s > CURVE_ORDER // 2:
+            s = CURVE_ORDER - s
+        der = self.cdata_to_der(self.deserialize_compact(r.to_bytes(32, "big") + s.to_bytes(32, "big")))
+        try:
+            return bool(public_key.verify(der, message, hasher=self._hasher))
+        except ValueError:
+            return False
+
+
+class CryptographyBackend:
+    name = "cryptography"
+
+    def __init__(self):
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, utils
+
+        self.InvalidSignature = InvalidSignature
+        self.serialization = serialization
+        self.ec = ec
+        self.utils = utils
+        self.algorithm = ec.ECDSA(utils.Prehashed(hashes.SHA1()))
+
+    def generate(self):
+        private_key = self.ec.generate_private_key(self.ec.SECP256K1())
+        return private_key.private_numbers().private_value.to_bytes(32, "big")
+
+    def load_private_key(self, private_key_bytes):
+        return self.ec.derive_private_key(int.from_bytes(private_key_bytes, "big"), self.ec.SECP256K1())
+
+    def public_key_bytes(self, private_key):
+        return private_key.public_key().public_bytes(
+            self.serialization.Encoding.X962, self.serialization.PublicFormat.UncompressedPoint
+        )[1:]
+
+    def load_public_key(self, public_key_bytes):
+        return self.ec.EllipticCurvePublicKey.from_encoded_point(self.ec.SECP256K1(), b"\x04" + public_key_bytes)
+
+    def sign(self, private_key, message):
+        r, s = self.utils.decode_dss_signature(private_key.sign(_digest(message), self.algorithm))
+        return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+    def verify(self, public_key, signature, message):
+        r, s = _split_signature(signature)
+        try:
+            public_key.verify(self.utils.encode_dss_signature(r, s), _digest(message), self.algorithm)
+            return True
+        except self.InvalidSignature:
+            return False
+
+
+class EcdsaBackend:
+    name = "ecdsa"
+
+    def __init__(self):
+        import ecdsa
+
+        self.ecdsa = ecdsa
+
+    def generate(self):
+        return self.ecdsa.SigningKey.generate(curve=self.ecdsa.SECP256k1).to_string()
+
+    def load_private_key(self, private_key_bytes):
+        return self.ecdsa.SigningKey.from_string(private_key_bytes, curve=self.ecdsa.SECP256k1)
+
+    def public_key_bytes(self, private_key):
+        return private_key.get_verifying_key().to_string()
+
+    def load_public_key(self, public_key_bytes):
+        return self.ecdsa.VerifyingKey.from_string(public_key_bytes, curve=self.ecdsa.SECP256k1)
+
+    def sign(self, private_key, message):
+        return private_key.sign(message)
+
+    def verify(self, public_key, signature, message):
+        try:
+            return public_key.verify(signature, message)
+        except self.ecdsa.BadSignatureError:
+            return False
+
+
+BACKENDS = [CoincurveBackend, CryptographyBackend, EcdsaBackend]
+
+
+def available_backends():
+    """Every backend whose library is installed, fastest first"""
+    backends = []
+    for backend_class in BACKENDS:
+        try:
+            backends.append(backend_class())
+        except ImportError:
+            continue
+    return backends
+
+
+def _select_backend():
+    backends = available_backends()
+    if ECDSA_BACKEND:
+        for candidate in backends:
+            if candidate.name == ECDSA_BACKEND:
+                return candidate
+        raise ImportError(f"ECDSA_BACKEND={ECDSA_BACKEND} is not installed")
+    if not backends:
+        raise ImportError("No ECDSA library installed (coincurve, cryptography or ecdsa)")
+    return backends[0]
+
+
+backend = _select_backend()
+
+
+def verify_signatures(batch, using=None):
+    """Check many (hash_hex, signature_hex, public_key_hex) triples; returns one bool each.
+
+    Each distinct public key is parsed once for the whole batch, which is
+    most of the per-call cost when a few signers sign many seeds.
+    """
+    using = using or backend
+    public_keys = {}
+    results = []
+    for hash_hex, signature_hex, public_key_hex in batch:
+        try:
+            if public_key_hex not in public_keys:
+                public_keys[public_key_hex] = using.load_public_key(bytes.fromhex(public_key_hex))
+            results.append(using.verify(
+                public_keys[public_key_hex], bytes.fromhex(signature_hex), bytes.fromhex(hash_hex)
+            ))
+        except Exception:
+            # Malformed hex, key or signature
+            results.append(False)
+    return results
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+import numpy as np
+
+from .models import SeedImage
+
+# Optional in-process copy of SeedImage.embedding for duplicate/verify lookups.
+# Disabled by default; with several Django processes each one holds its own copy,
+# so it is rebuilt from the database every EMBEDDING_CACHE_TTL seconds.
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE", "false").lower() == "true"
+EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", "300"))
+# How often a lookup may check the database for seeds saved by other processes
+EMBEDDING_CACHE_CATCH_UP_MS = int(os.getenv("EMBEDDING_CACHE_CATCH_UP_MS", "1000"))
+
+
+def _normalize(matrix):
+    """Scale rows to unit length so cosine distance is 1 - dot product"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class EmbeddingIndex:
+    """Flat (exact) cosine index over all seed embeddings held as a float32 matrix"""
+
+    def __init__(self, ttl, catch_up_interval=0):
+        self.ttl = ttl
+        self.catch_up_interval = catch_up_interval
+        self.caught_up_at = None
+        self.lock = threading.Lock()
+        self.building = False
+        self.built_at = None
+        # (ids, unit-length vectors) swapped together so readers never see a partial update
+        self.data = (np.empty(0, dtype=np.int64), np.empty((0, 512), dtype=np.float32))
+        # Highest id the last build loaded, and the ids above it already looked at since
+        self.watermark = 0
+        self.checked = set()
+        # add()/remove() calls made while a build is reading, replayed after its swap
+        self.changes = None
+
+    def is_fresh(self):
+        return self.built_at is not None and time.monotonic() - self.built_at < self.ttl
+
+    def build(self):
+        """Load every embedding from the database"""
+        built_at = time.monotonic()
+        with self.lock:
+            self.changes = []
+        try:
+            ids = []
+            vectors = []
+            rows = SeedImage.objects.exclude(embedding__isnull=True).values_list("id", "embedding")
+            for seed_id, embedding in rows.iterator(chunk_size=2000):
+                ids.append(seed_id)
+                vectors.append(np.asarray(embedding, dtype=np.float32))
+
+            ids = np.asarray(ids, dtype=np.int64)
+            # Only rows read here count towards the watermark, not the replayed ones
+            watermark = int(ids.max()) if len(ids) else 0
+            matrix = _normalize(np.stack(vectors)) if vectors else np.empty((0, 512), dtype=np.float32)
+            with self.lock:
+                # Seeds added or deleted while the rows were being read would otherwise be lost
+                for change, *args in self.changes:
+                    if change == "add":
+                        new_ids, new_vectors = args
+                        fresh = ~np.isin(new_ids, ids)
+                        ids = np.concatenate([ids, new_ids[fresh]])
+                        matrix = np.vstack([matrix, new_vectors[fresh]])
+                    else:
+                        keep = ids != args[0]
+                        ids, matrix = ids[keep], matrix[keep]
+                self.data = (ids, matrix)
+                self.watermark = watermark
+                self.checked = set()
+                self.built_at = built_at
+        finally:
+            with self.lock:
+                self.changes = None
+        print(f"Embedding cache built: {len(ids)} seeds")
+
+    def catch_up(self):
+        """Load seeds inserted since the last build that this process hasn't seen.
+
+        Covers rows written by other processes, so a fresh cache still answers
+        for every committed seed. One indexed range query on the primary key,
+        run at most once per catch_up_interval seconds; calls in between
+        return at once, so most lookups never touch the database.
+        """
+        now = time.monotonic()
+        with self.lock:
+            if self.caught_up_at is not None and now - self.caught_up_at < self.catch_up_interval:
+                return
+            self.caught_up_at = now
+            watermark = self.watermark
+            known = set(self.data[0][self.data[0] > watermark].tolist()) | self.checked
+        unseen = [
+            seed_id for seed_id in SeedImage.objects.filter(id__gt=watermark).values_list("id", flat=True)
+            if seed_id not in known
+        ]
+        if not unseen:
+            return
+        self.add(list(SeedImage.objects.filter(pk__in=unseen).only("id", "embedding")))
+        with self.lock:
+            if self.watermark == watermark:
+                self.checked.update(unseen)
+
+    def build_async(self):
+        """Rebuild in a background thread unless a rebuild is already running"""
+        with self.lock:
+            if self.building:
+                return
+            self.building = True
+
+        def run():
+            try:
+                self.build()
+            except Exception as e:
+                print(f"Embedding cache build failed: {e}")
+            finally:
+                with self.lock:
+                    self.building = False
+
+        threading.Thread(target=run, name="embedding-cache", daemon=True).start()
+
+    def add(self, seeds):
+        """Append newly inserted seeds"""
+        seeds = [s for s in seeds if s.pk is not None and s.embedding is not None]
+        if not seeds:
+            return
+        new_ids = np.asarray([s.pk for s in seeds], dtype=np.int64)
+        new_vectors = _normalize(np.stack([np.asarray(s.embedding, dtype=np.float32) for s in seeds]))
+        with self.lock:
+            ids, matrix = self.data
+            fresh = ~np.isin(new_ids, ids)
+            self.data = (np.concatenate([ids, new_ids[fresh]]), np.vstack([matrix, new_vectors[fresh]]))
+            if self.changes is not None:
+                self.changes.append(("add", new_ids, new_vectors))
+
+    def remove(self, seed_id):
+        with self.lock:
+            ids, matrix = self.data
+            keep = ids != seed_id
+            self.data = (ids[keep], matrix[keep])
+            if self.changes is not None:
+                self.changes.append(("remove", seed_id))
+
+    def search(self, embeddings, threshold=0.1, k=1):
+        """Return one list of (seed_id, distance) per embedding, closest first, distance < threshold"""
+        ids, matrix = self.data
+        results = [[] for _ in embeddings]
+        if len(ids) == 0:
+            return results
+
+        positions = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+        if not positions:
+            return results
+
+        queries = _normalize(np.stack([np.asarray(embeddings[i], dtype=np.float32) for i in positions]))
+        distances = 1 - queries @ matrix.T  # one matrix product for every detection
+
+        top = min(k, len(ids))
+        for row, i in zip(distances, positions):
+            nearest = np.argpartition(row, top - 1)[:top]
+            for j in nearest[np.argsort(row[nearest])]:
+                if row[j] < threshold:
+                    results[i].append((int(ids[j]), float(row[j])))
+
+        return results
+
+
+index = EmbeddingIndex(EMBEDDING_CACHE_TTL, EMBEDDING_CACHE_CATCH_UP_MS / 1000)
@@ -0,0 +1,39 @@
+import os
+import json
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+EXPORT_FIELDS = [
+    "id",
+    "image",
+    "original_image_path",
+    "bbox",
+    "detections",
+    "prediction",
+    "confidence",
+    "quality",
+    "processing_time_ms",
+    "image_width",
+    "image_height",
+    "uploaded_at",
+    "blockchain_tx_id",
+    "blockchain_type",
+    "signer_name",
+    "certification_status",
+]
+
+
+def export_rows(queryset, include_embeddings=False):
+    """Values queryset of the exported columns in id order, for .iterator()/.aiterator()"""
+    fields = EXPORT_FIELDS + (["embedding"] if include_embeddings else [])
+    return queryset.order_by("id").values(*fields)
+
+
+def to_ndjson(row):
+    """Serialise one exported row as a line of NDJSON"""
+    record = dict(row)
+    record["uploaded_at"] = record["uploaded_at"].isoformat()
+    if record.get("embedding") is not None:
+        record["embedding"] = record["embedding"].tolist()
+    return json.dumps(record) + "\n"
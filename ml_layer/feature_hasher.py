@@ -1,5 +1,9 @@
-from ecdsa import SigningKey, VerifyingKey, SECP256k1
 import hashlib
+import json
+import os
+import tempfile
+import threading
+from . import ecdsa_backend
 
 # Dictionary of authorized signers (nurseries/certifiers)
 
@@ -21,71 +25,166 @@ SIGNERS = {
     }
 }
 
+# Keys are looked up, in order, in: the JSON keystore file
+# ({"Nursery_A": {"private_key": "<hex>"}, ...}), SIGNER_<ID>_PRIVATE_KEY
+# (e.g. SIGNER_NURSERY_A_PRIVATE_KEY), then SIGNERS above.
+SIGNER_KEYSTORE = os.getenv("SIGNER_KEYSTORE")
+
+class SignerRegistry:
+    """Parsed signing keys for every signer, loaded on the first signature in a process.
+
+    Signers with only placeholder keys get a generated key pair, which is
+    saved to SIGNER_KEYSTORE when set so it stays the same across restarts.
+    """
+
+    def __init__(self, signers, keystore_path=None):
+        self.signers = signers
+        self.keystore_path = keystore_path
+        self.keys = None
+        self.lock = threading.Lock()
+
+    def _read_keystore(self):
+        """Raises ValueError for an unreadable keystore rather than replacing it with new keys"""
+        if not self.keystore_path or not os.path.exists(self.keystore_path):
+            return {}
+        try:
+            with open(self.keystore_path) as f:
+                keystore = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Signer keystore {self.keystore_path} could not be read: {e}")
+        if not isinstance(keystore, dict):
+            raise ValueError(f"Signer keystore {self.keystore_path} must be a JSON object of signer ids")
+        return keystore
+
+    def _write_keystore(self, keystore):
+        # Write-then-rename so a crash never leaves a half-written keystore
+        directory = os.path.dirname(os.path.abspath(self.keystore_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(keystore, f, indent=2)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.keystore_path)
+
+    def _private_key_hex(self, signer_id, keystore):
+        if (keystore.get(signer_id) or {}).get("private_key"):
+            return keystore[signer_id]["private_key"]
+        from_env = os.getenv(f"SIGNER_{signer_id.upper()}_PRIVATE_KEY")
+        if from_env:
+            return from_env
+        configured = self.signers[signer_id]["private_key"]
+        return None if configured.startswith("your_private") else configured
+
+    def load(self):
+        """Parse every signer's key; safe to call more than once"""
+        with self.lock:
+            if self.keys is not None:
+                return self.keys
+
+            keystore = self._read_keystore()
+            generated = False
+            keys = {}
+            for signer_id in self.signers:
+                private_key_hex = self._private_key_hex(signer_id, keystore)
+                if private_key_hex:
+                    try:
+                        private_key_bytes = bytes.fromhex(private_key_hex)
+                    except ValueError:
+                        raise ValueError(f"Private key for signer {signer_id} is not valid hex")
+                else:
+                    print(f"No key configured for signer {signer_id}, generating one")
+                    private_key_bytes = ecdsa_backend.backend.generate()
+                    generated = True
+
+                private_key = ecdsa_backend.backend.load_private_key(private_key_bytes)
+                public_key_bytes = ecdsa_backend.backend.public_key_bytes(private_key)
+                public_key = ecdsa_backend.backend.load_public_key(public_key_bytes)
+                keys[signer_id] = (private_key, public_key, public_key_bytes.hex())
+                if not private_key_hex:
+                    keystore[signer_id] = {"private_key": private_key_bytes.hex(), "public_key": public_key_bytes.hex()}
+
+            if generated and self.keystore_path:
+                try:
+                    self._write_keystore(keystore)
+                except OSError as e:
+                    print(f"Could not save generated signer keys to {self.keystore_path}: {e}")
+
+            self.keys = keys
+            return keys
+
+    def get(self, signer_id):
+        """(private_key, public_key, public_key_hex) for a signer, loading keys on first use.
+
+        Raises ValueError for an unknown signer or a bad keystore.
+        """
+        if signer_id not in self.signers:
+            raise ValueError(f"Unknown signer: {signer_id}")
+        return self.load()[signer_id]
+
+    def public_key_hex(self, signer_id):
+        """A signer's public key if one is known, without generating keys; None otherwise"""
+        if self.keys is not None:
+            return self.keys[signer_id][2]
+        try:
+            keystore = self._read_keystore()
+            if (keystore.get(signer_id) or {}).get("public_key"):
+                return keystore[signer_id]["public_key"]
+            private_key_hex = self._private_key_hex(signer_id, keystore)
+            if not private_key_hex:
+                return None
+            private_key = ecdsa_backend.backend.load_private_key(bytes.fromhex(private_key_hex))
+            return ecdsa_backend.backend.public_key_bytes(private_key).hex()
+        except ValueError as e:
+            print(f"Could not read public key for signer {signer_id}: {e}")
+            return None
+
+registry = SignerRegistry(SIGNERS, SIGNER_KEYSTORE)
+
 def get_signer_list():
     return [
-        {"id": signer_id, "name": signer_info["name"]}
+        {"id": signer_id, "name": signer_info["name"], "public_key": registry.public_key_hex(signer_id)}
         for signer_id, signer_info in SIGNERS.items()
     ]
 
 def get_signer_keys(signer_id):
-    if signer_id not in SIGNERS:
-        raise ValueError(f"Unknown signer: {signer_id}")
-
-    signer_info = SIGNERS[signer_id]
-
-    # If keys are provided as hex strings, load them
-    if signer_info["private_key"].startswith("your_private"):
-        # Generate new keys if placeholder is still there
-        private_key = SigningKey.generate(curve=SECP256k1)
-        public_key = private_key.get_verifying_key()
-    else:
-        private_key = SigningKey.from_string(
-            bytes.fromhex(signer_info["private_key"]),
-            curve=SECP256k1
-        )
-        public_key = VerifyingKey.from_string(
-            bytes.fromhex(signer_info["public_key"]),
-            curve=SECP256k1
-        )
-
+    private_key, public_key, _ = registry.get(signer_id)
     return private_key, public_key
 
-def sign_hash(hash_hex, signer_id):
-    if signer_id not in SIGNERS:
-        raise ValueError(f"Unknown signer: {signer_id}")
+def get_public_key(signer_id):
+    return registry.get(signer_id)[2]
 
+def sign_hash(hash_hex, signer_id):
     # Get signer's keys
-    private_key, public_key = get_signer_keys(signer_id)
+    private_key, _, public_key_hex = registry.get(signer_id)
 
     # Sign the hash
     hash_bytes = bytes.fromhex(hash_hex)
-    signature_bytes = private_key.sign(hash_bytes)
+    signature_bytes = ecdsa_backend.backend.sign(private_key, hash_bytes)
 
     # Convert to hex
     signature_hex = signature_bytes.hex()
-    public_key_hex = public_key.to_string().hex()
 
     return signature_hex, public_key_hex, SIGNERS[signer_id]["name"]
 
+def sign_hashes(hash_hexes, signer_id):
+    """Sign many hashes with one signer"""
+    private_key, _, public_key_hex = registry.get(signer_id)
+
+    signatures = [ecdsa_backend.backend.sign(private_key, bytes.fromhex(hash_hex)).hex() for hash_hex in hash_hexes]
+
+    return signatures, public_key_hex, SIGNERS[signer_id]["name"]
+
 def verify_signature(hash_hex, signature_hex, public_key_hex):
-    try:
-        public_key = VerifyingKey.from_string(
-            bytes.fromhex(public_key_hex),
-            curve=SECP256k1
-        )
-        hash_bytes = bytes.fromhex(hash_hex)
-        signature_bytes = bytes.fromhex(signature_hex)
-
-        public_key.verify(signature_bytes, hash_bytes)
-        return True
-    except Exception:
-        return False
+    return ecdsa_backend.verify_signatures([(hash_hex, signature_hex, public_key_hex)])[0]
+
+def verify_signatures(batch):
+    """Check many (hash_hex, signature_hex, public_key_hex) triples at once; returns one bool each"""
+    return ecdsa_backend.verify_signatures(batch)
 
 def generate_signer_keypair():
-    private_key = SigningKey.generate(curve=SECP256k1)
-    public_key = private_key.get_verifying_key()
+    private_key_bytes = ecdsa_backend.backend.generate()
+    private_key = ecdsa_backend.backend.load_private_key(private_key_bytes)
 
-    private_key_hex = private_key.to_string().hex()
-    public_key_hex = public_key.to_string().hex()
+    private_key_hex = private_key_bytes.hex()
+    public_key_hex = ecdsa_backend.backend.public_key_bytes(private_key).hex()
 
     return private_key_hex, public_key_hex
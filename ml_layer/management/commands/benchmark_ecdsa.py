@@ -0,0 +1,42 @@
+import hashlib
+import time
+from django.core.management.base import BaseCommand
+
+from ml_layer import ecdsa_backend
+
+
+class Command(BaseCommand):
+    help = "Compare sign/verify throughput of the installed ECDSA backends"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500, help="Operations timed per measurement")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        hashes = [hashlib.sha256(str(i).encode()).digest() for i in range(iterations)]
+
+        self.stdout.write(f"Active backend: {ecdsa_backend.backend.name}")
+        self.stdout.write(f"{'backend':<14}{'sign/s':>12}{'verify/s':>12}{'batch verify/s':>16}")
+
+        for backend in ecdsa_backend.available_backends():
+            private_key = backend.load_private_key(backend.generate())
+            public_key_hex = backend.public_key_bytes(private_key).hex()
+
+            start = time.perf_counter()
+            signatures = [backend.sign(private_key, digest) for digest in hashes]
+            sign_rate = iterations / (time.perf_counter() - start)
+
+            batch = [(digest.hex(), signature.hex(), public_key_hex) for digest, signature in zip(hashes, signatures)]
+
+            # One call per signature, parsing the public key each time
+            start = time.perf_counter()
+            single = [ecdsa_backend.verify_signatures([item], using=backend)[0] for item in batch]
+            verify_rate = iterations / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            batched = ecdsa_backend.verify_signatures(batch, using=backend)
+            batch_rate = iterations / (time.perf_counter() - start)
+
+            if not (all(single) and all(batched)):
+                self.stderr.write(f"{backend.name}: signatures failed to verify")
+            self.stdout.write(f"{backend.name:<14}{sign_rate:>12.0f}{verify_rate:>12.0f}{batch_rate:>16.0f}")
@@ -0,0 +1,59 @@
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from ml_layer.certification import claim_jobs, run_jobs, CERTIFY_BATCH_SIZE, CERTIFY_STALE_AFTER
+
+
+class Command(BaseCommand):
+    help = "Process queued blockchain certification jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Number of worker threads")
+        parser.add_argument("--poll", type=float, default=1.0, help="Seconds to sleep when the queue is empty")
+        parser.add_argument(
+            "--batch-size", type=int, default=CERTIFY_BATCH_SIZE,
+            help="Max jobs sent to a chain in one batch",
+        )
+        parser.add_argument(
+            "--stale-after", type=int, default=CERTIFY_STALE_AFTER,
+            help="Requeue running jobs whose worker has sent no heartbeat for this many seconds",
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=self.work, args=(stop, options), name=f"certify-{i}", daemon=True)
+            for i in range(options["workers"])
+        ]
+        for thread in threads:
+            thread.start()
+
+        self.stdout.write(f"Certification worker started with {len(threads)} threads")
+        try:
+            while any(thread.is_alive() for thread in threads):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def work(self, stop, options):
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                try:
+                    jobs = claim_jobs(limit=options["batch_size"], stale_after=options["stale_after"])
+                    if not jobs:
+                        stop.wait(options["poll"])
+                        continue
+
+                    for job in run_jobs(jobs):
+                        self.stdout.write(f"Job {job.id} (seed {job.seed_id}): {job.status}")
+                except Exception as e:
+                    # e.g. database restarting; back off and keep the thread alive
+                    self.stderr.write(f"Certification worker error: {e}")
+                    stop.wait(options["poll"])
+        finally:
+            connection.close()
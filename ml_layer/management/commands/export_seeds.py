@@ -0,0 +1,47 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_layer.models import SeedImage
+from ml_layer.pagination import filter_seeds
+from ml_layer.export import export_rows, to_ndjson, EXPORT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = "Export seed records as NDJSON (one JSON object per line)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", "-o", help="File to write to (default: stdout)")
+        parser.add_argument("--embeddings", action="store_true", help="Include the 512-d embedding of each seed")
+        parser.add_argument("--prediction", help="Only seeds of this class")
+        parser.add_argument("--blockchain-type", help="Only seeds certified on this chain")
+        parser.add_argument("--since", help="Only seeds uploaded at or after this ISO 8601 datetime")
+        parser.add_argument("--until", help="Only seeds uploaded before this ISO 8601 datetime")
+        parser.add_argument(
+            "--chunk-size", type=int, default=EXPORT_CHUNK_SIZE,
+            help="Rows fetched per round trip from the database",
+        )
+
+    def handle(self, *args, **options):
+        params = {
+            "prediction": options["prediction"],
+            "blockchain_type": options["blockchain_type"],
+            "since": options["since"],
+            "until": options["until"],
+        }
+        try:
+            queryset = filter_seeds(SeedImage.objects.all(), params)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        rows = export_rows(queryset, options["embeddings"])
+        out = open(options["output"], "w") if options["output"] else sys.stdout
+        count = 0
+        try:
+            for row in rows.iterator(chunk_size=options["chunk_size"]):
+                out.write(to_ndjson(row))
+                count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        self.stderr.write(f"Exported {count} seeds")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ml_layer import stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard seed counters from the SeedImage table"
+
+    def handle(self, *args, **options):
+        rows = stats.rebuild()
+        self.stdout.write(f"Rebuilt {rows} seed counters")
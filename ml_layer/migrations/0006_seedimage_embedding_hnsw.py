@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:00
+
+import pgvector.django
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ml_layer", "0005_seedimage_bbox_seedimage_original_image_path"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="seedimage",
+            index=pgvector.django.HnswIndex(
+                ef_construction=64,
+                fields=["embedding"],
+                m=16,
+                name="seedimage_embedding_hnsw",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def mark_certified(apps, schema_editor):
+    """Seeds that already have a transaction id were certified synchronously"""
+    SeedImage = apps.get_model("ml_layer", "SeedImage")
+    SeedImage.objects.exclude(blockchain_tx_id__isnull=True).exclude(blockchain_tx_id="").update(
+        certification_status="certified"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ml_layer", "0006_seedimage_embedding_hnsw"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="seedimage",
+            name="certification_status",
+            field=models.CharField(
+                choices=[
+                    ("not_certified", "Not certified"),
+                    ("queued", "Queued"),
+                    ("certifying", "Certifying"),
+                    ("certified", "Certified"),
+                    ("failed", "Failed"),
+                ],
+                default="not_certified",
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(mark_certified, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="CertificationJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("blockchain_type", models.CharField(default="fabric", max_length=20)),
+                ("signer_id", models.CharField(max_length=100)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.IntegerField(default=0)),
+                ("error", models.TextField(blank=True, null=True)),
+                ("blockchain_tx_id", models.CharField(blank=True, max_length=255, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "seed",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="certification_jobs",
+                        to="ml_layer.seedimage",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "created_at"],
+                        name="certjob_status_created_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ml_layer", "0007_certificationjob_seedimage_certification_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChainRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("chain", models.CharField(max_length=20)),
+                ("seed_id", models.CharField(max_length=64)),
+                ("transaction_id", models.CharField(blank=True, max_length=255, null=True)),
+                ("record", models.JSONField(blank=True, null=True)),
+                ("found", models.BooleanField(default=True)),
+                ("fetched_at", models.DateTimeField(auto_now=True)),
+                ("expires_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["transaction_id"], name="chainrecord_tx_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("chain", "seed_id"), name="chainrecord_chain_seed_uniq"
+                    ),
+                ],
+            },
+        ),
+    ]
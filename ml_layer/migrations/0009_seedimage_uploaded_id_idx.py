@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ml_layer", "0008_chainrecord"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="seedimage",
+            index=models.Index(
+                fields=["-uploaded_at", "-id"], name="seedimage_uploaded_id_idx"
+            ),
+        ),
+    ]
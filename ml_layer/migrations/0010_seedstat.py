@@ -0,0 +1,64 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:40
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def build_stats(apps, schema_editor):
+    """Fill the counters from the seeds already in the table"""
+    SeedImage = apps.get_model("ml_layer", "SeedImage")
+    SeedStat = apps.get_model("ml_layer", "SeedStat")
+    synced = Q(blockchain_tx_id__isnull=False) & ~Q(blockchain_tx_id="")
+
+    overall = SeedImage.objects.aggregate(total=Count("id"), certified=Count("id", filter=synced))
+    counters = {("all", ""): [overall["total"], overall["certified"]]}
+    for dimension, column in (
+        ("class", "prediction"), ("quality", "quality"), ("chain", "blockchain_type"), ("signer", "signer_name")
+    ):
+        counts = SeedImage.objects.values(column).annotate(total=Count("id"), certified=Count("id", filter=synced))
+        for row in counts:
+            # NULL and "" share a key
+            counter = counters.setdefault((dimension, row[column] or ""), [0, 0])
+            counter[0] += row["total"]
+            counter[1] += row["certified"]
+
+    SeedStat.objects.bulk_create([
+        SeedStat(dimension=dimension, key=key, total=total, certified=certified)
+        for (dimension, key), (total, certified) in counters.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ml_layer", "0009_seedimage_uploaded_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeedStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dimension", models.CharField(max_length=20)),
+                ("key", models.CharField(blank=True, default="", max_length=100)),
+                ("total", models.IntegerField(default=0)),
+                ("certified", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("dimension", "key"), name="seedstat_dimension_key_uniq"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-from pgvector.django import VectorField
+from pgvector.django import VectorField, HnswIndex
 
 
 class SeedImage(models.Model):
@@ -30,6 +30,17 @@ class SeedImage(models.Model):
         blank=True
     )
     signer_name = models.CharField(max_length=100, default='Unknown', null=True, blank=True)
+    certification_status = models.CharField(
+        max_length=20,
+        choices=[
+            ('not_certified', 'Not certified'),
+            ('queued', 'Queued'),
+            ('certifying', 'Certifying'),
+            ('certified', 'Certified'),
+            ('failed', 'Failed'),
+        ],
+        default='not_certified',
+    )
 
     def __str__(self):
         return f"Seed {self.pk} - {self.prediction} ({self.confidence})"
@@ -39,6 +50,93 @@ class SeedImage(models.Model):
         indexes = [
             models.Index(fields=['prediction']),
             models.Index(fields=['uploaded_at']),
+            # Keyset pagination order for the history/database APIs
+            models.Index(fields=['-uploaded_at', '-id'], name='seedimage_uploaded_id_idx'),
             models.Index(fields=['blockchain_tx_id']),
             models.Index(fields=['blockchain_type']),
-        ]
\ No newline at end of file
+            # ANN index for duplicate/verify lookups (CosineDistance)
+            HnswIndex(
+                name='seedimage_embedding_hnsw',
+                fields=['embedding'],
+                m=16,
+                ef_construction=64,
+                opclasses=['vector_cosine_ops'],
+            ),
+        ]
+
+
+class CertificationJob(models.Model):
+    """Queued blockchain certification of one seed, processed by `manage.py certify_worker`"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    seed = models.ForeignKey(SeedImage, on_delete=models.CASCADE, related_name='certification_jobs')
+    blockchain_type = models.CharField(max_length=20, default='fabric')
+    signer_id = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.IntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    blockchain_tx_id = models.CharField(max_length=255, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"CertificationJob {self.pk} - seed {self.seed_id} ({self.status})"
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='certjob_status_created_idx'),
+        ]
+
+
+class ChainRecord(models.Model):
+    """Local copy of a seed record read from a blockchain client.
+
+    Found Sawtooth records never expire, since the seed processor refuses to
+    overwrite an address. Fabric records can be overwritten, and not-found
+    answers can become stale, so both carry expires_at.
+    """
+    chain = models.CharField(max_length=20)
+    seed_id = models.CharField(max_length=64)
+    transaction_id = models.CharField(max_length=255, null=True, blank=True)
+    record = models.JSONField(null=True, blank=True)
+    found = models.BooleanField(default=True)
+    fetched_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"ChainRecord {self.chain}/{self.seed_id} ({'found' if self.found else 'missing'})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['chain', 'seed_id'], name='chainrecord_chain_seed_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['transaction_id'], name='chainrecord_tx_idx'),
+        ]
+
+
+class SeedStat(models.Model):
+    """Materialised seed counter for the dashboard, kept current by ml_layer.stats.
+
+    One row per (dimension, key), e.g. ("class", "corn") or ("chain", "fabric");
+    ("all", "") holds the table-wide totals.
+    """
+    dimension = models.CharField(max_length=20)
+    key = models.CharField(max_length=100, blank=True, default='')
+    total = models.IntegerField(default=0)
+    certified = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"SeedStat {self.dimension}/{self.key}: {self.certified}/{self.total}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='seedstat_dimension_key_uniq'),
+        ]
@@ -0,0 +1,192 @@
+import os
+import asyncio
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared HTTP plumbing for calls to the ML server and the blockchain clients.
+# Sessions keep connections alive per host; retries cover connection errors
+# (and idempotent requests); a circuit breaker per chain skips a dead chain
+# for a cooldown instead of paying its full timeout on every request.
+# Async views get the same retries and breakers over a pooled httpx client.
+OUTBOUND_RETRIES = int(os.getenv("OUTBOUND_RETRIES", "2"))
+OUTBOUND_BACKOFF = float(os.getenv("OUTBOUND_BACKOFF", "0.3"))
+OUTBOUND_POOL_SIZE = int(os.getenv("OUTBOUND_POOL_SIZE", "20"))
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "3"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling a host whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; after `cooldown` seconds lets one trial call through"""
+
+    def __init__(self, name, threshold, cooldown):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self.trial_running:
+                return False
+            self.trial_running = True  # half-open
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(f"Circuit breaker opened for {self.name}")
+                self.opened_at = time.monotonic()
+
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+
+_sessions = {}
+_breakers = {}
+_lock = threading.Lock()
+
+
+def _session_for(url):
+    """Return the pooled session for the URL's scheme://host:port"""
+    parts = urlsplit(url)
+    key = f"{parts.scheme}://{parts.netloc}"
+
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            retry = Retry(
+                total=OUTBOUND_RETRIES,
+                backoff_factor=OUTBOUND_BACKOFF,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=OUTBOUND_POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount(key, adapter)
+            _sessions[key] = session
+        return session
+
+
+def breaker(name):
+    """Return the circuit breaker for a chain (created on first use)"""
+    with _lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, BREAKER_FAILURES, BREAKER_COOLDOWN)
+        return _breakers[name]
+
+
+def request(method, url, breaker_name=None, **kwargs):
+    """Send a request over the pooled session, guarded by the named circuit breaker if given"""
+    guard = breaker(breaker_name) if breaker_name else None
+    if guard is not None and not guard.allow():
+        raise CircuitOpenError(f"Circuit open for {breaker_name}, skipping {url}")
+
+    try:
+        response = _session_for(url).request(method, url, **kwargs)
+    except Exception:
+        # Any exception, not just network ones, must end a half-open trial
+        if guard is not None:
+            guard.record_failure()
+        raise
+
+    if guard is not None:
+        if response.status_code >= 500:
+            guard.record_failure()
+        else:
+            guard.record_success()
+    return response
+
+
+def get(url, breaker_name=None, **kwargs):
+    return request("GET", url, breaker_name=breaker_name, **kwargs)
+
+
+def post(url, breaker_name=None, **kwargs):
+    return request("POST", url, breaker_name=breaker_name, **kwargs)
+
+
+# ============== Async client ==============
+
+# One AsyncClient per event loop: an ASGI worker runs a single loop, while
+# async views under WSGI get a fresh loop per request (and no pooling).
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _async_client():
+    """Return the pooled AsyncClient for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        # Transport retries cover connection errors only; status retries are done in async_request
+        transport = httpx.AsyncHTTPTransport(
+            retries=OUTBOUND_RETRIES,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=OUTBOUND_POOL_SIZE),
+        )
+        client = httpx.AsyncClient(transport=transport)
+        _async_clients[loop] = client
+    return client
+
+
+async def async_request(method, url, breaker_name=None, **kwargs):
+    """Async counterpart of request(); GETs are retried on 502/503/504 with backoff"""
+    guard = breaker(breaker_name) if breaker_name else None
+    if guard is not None and not guard.allow():
+        raise CircuitOpenError(f"Circuit open for {breaker_name}, skipping {url}")
+
+    client = _async_client()
+    try:
+        attempt = 0
+        while True:
+            response = await client.request(method, url, **kwargs)
+            if method != "GET" or response.status_code not in (502, 503, 504) or attempt >= OUTBOUND_RETRIES:
+                break
+            await asyncio.sleep(OUTBOUND_BACKOFF * 2 ** attempt)
+            attempt += 1
+    except (Exception, asyncio.CancelledError):
+        # Any exception must end a half-open trial; a call cancelled at a
+        # caller's deadline counts against the host too
+        if guard is not None:
+            guard.record_failure()
+        raise
+
+    if guard is not None:
+        if response.status_code >= 500:
+            guard.record_failure()
+        else:
+            guard.record_success()
+    return response
+
+
+async def async_get(url, breaker_name=None, **kwargs):
+    return await async_request("GET", url, breaker_name=breaker_name, **kwargs)
+
+
+async def async_post(url, breaker_name=None, **kwargs):
+    return await async_request("POST", url, breaker_name=breaker_name, **kwargs)
@@ -0,0 +1,83 @@
+import base64
+import json
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import SeedImage
+
+# Page size for the list APIs (?limit=)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(uploaded_at, seed_id):
+    """Opaque cursor pointing just past (uploaded_at, id)"""
+    raw = json.dumps([uploaded_at.isoformat(), seed_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor. Raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        uploaded_at, seed_id = json.loads(raw)
+        uploaded_at = parse_datetime(uploaded_at)
+        seed_id = int(seed_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if uploaded_at is None:
+        raise ValueError("Invalid cursor")
+    return uploaded_at, seed_id
+
+
+def page_size(params):
+    """Read ?limit=, capped at MAX_PAGE_SIZE. Raises ValueError if it isn't a positive integer."""
+    try:
+        limit = int(params.get("limit", DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def filter_seeds(queryset, params):
+    """Apply the ?prediction=, ?blockchain_type=, ?since= and ?until= filters.
+
+    Each maps onto an indexed column. Raises ValueError for a bad date.
+    """
+    if params.get("prediction"):
+        queryset = queryset.filter(prediction=params["prediction"])
+    if params.get("blockchain_type"):
+        queryset = queryset.filter(blockchain_type=params["blockchain_type"])
+    for param, lookup in (("since", "uploaded_at__gte"), ("until", "uploaded_at__lt")):
+        if params.get(param):
+            value = parse_datetime(params[param])
+            if value is None:
+                raise ValueError(f"{param} must be an ISO 8601 datetime")
+            queryset = queryset.filter(**{lookup: value})
+    return queryset
+
+
+def seed_page(params, fields):
+    """One page of SeedImage rows as dicts of `fields`, newest first.
+
+    Pages by keyset on (uploaded_at, id) so later pages cost the same as the
+    first. Returns (rows, next_cursor); next_cursor is None on the last page.
+    Raises ValueError for bad parameters.
+    """
+    limit = page_size(params)
+    queryset = filter_seeds(SeedImage.objects.all(), params)
+
+    if params.get("cursor"):
+        uploaded_at, seed_id = decode_cursor(params["cursor"])
+        queryset = queryset.filter(Q(uploaded_at__lt=uploaded_at) | Q(uploaded_at=uploaded_at, id__lt=seed_id))
+
+    columns = list(dict.fromkeys(["id", "uploaded_at", *fields]))
+    rows = list(queryset.order_by("-uploaded_at", "-id").values(*columns)[:limit + 1])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["uploaded_at"], rows[-1]["id"])
+    return rows, next_cursor
@@ -0,0 +1,95 @@
+from django.db import connection
+import numpy as np
+
+from .models import SeedImage
+from . import embedding_cache
+
+
+def _cache_ready():
+    """True if the in-memory index can answer; otherwise schedule a rebuild"""
+    if not embedding_cache.EMBEDDING_CACHE_ENABLED:
+        return False
+    if embedding_cache.index.is_fresh():
+        return True
+    embedding_cache.index.build_async()
+    return False
+
+
+def _vector_literal(embedding):
+    """Format an embedding as a pgvector text literal"""
+    return "[" + ",".join(map(str, np.asarray(embedding, dtype=np.float32).tolist())) + "]"
+
+
+def find_similar_seeds(embeddings, threshold=0.1, k=1):
+    """Find the k nearest seeds for every embedding in a single query.
+
+    Returns one list per input embedding of (seed, distance) pairs, closest
+    first and limited to distance < threshold. Entries for None embeddings
+    are empty lists.
+    """
+    results = [[] for _ in embeddings]
+    positions = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+    if not positions:
+        return results
+
+    if _cache_ready():
+        # Pick up seeds other processes saved since the last rebuild (throttled) before trusting a miss
+        embedding_cache.index.catch_up()
+        return _attach_seeds(embedding_cache.index.search(embeddings, threshold, k))
+
+    table = SeedImage._meta.db_table
+    # One LATERAL index scan per query vector; each keeps ORDER BY ... LIMIT k
+    # so the HNSW index is used, and the threshold is applied outside it
+    sql = f"""
+        SELECT q.idx, m.id, m.distance
+        FROM unnest(%s::vector[]) WITH ORDINALITY AS q(embedding, idx)
+        CROSS JOIN LATERAL (
+            SELECT s.id, s.embedding <=> q.embedding AS distance
+            FROM {table} s
+            ORDER BY s.embedding <=> q.embedding
+            LIMIT %s
+        ) m
+        WHERE m.distance < %s
+        ORDER BY q.idx, m.distance
+    """
+    vectors = [_vector_literal(embeddings[i]) for i in positions]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [vectors, k, threshold])
+        rows = cursor.fetchall()
+
+    for idx, seed_id, distance in rows:
+        results[positions[idx - 1]].append((seed_id, distance))
+
+    return _attach_seeds(results)
+
+
+def _attach_seeds(results):
+    """Replace seed ids in (seed_id, distance) match lists with SeedImage objects"""
+    seeds = SeedImage.objects.in_bulk({seed_id for matches in results for seed_id, _ in matches})
+    return [
+        [(seeds[seed_id], distance) for seed_id, distance in matches if seed_id in seeds]
+        for matches in results
+    ]
+
+
+def find_similar_in_batch(embedding, batch, threshold=0.1):
+    """Return the index of the closest embedding in batch within threshold, or None.
+
+    Used to catch near-identical seeds within one upload, which the database
+    check can't see because none of them are saved yet.
+    """
+    candidates = [i for i, other in enumerate(batch) if other is not None]
+    if embedding is None or not candidates:
+        return None
+
+    query = np.asarray(embedding, dtype=np.float32)
+    matrix = np.stack([np.asarray(batch[i], dtype=np.float32) for i in candidates])
+
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    distances = 1 - (matrix @ query) / np.where(norms == 0, 1, norms)
+
+    best = int(np.argmin(distances))
+    if distances[best] >= threshold:
+        return None
+    return candidates[best]
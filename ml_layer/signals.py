@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import SeedImage
+from . import embedding_cache
+from . import stats
+
+
+@receiver(post_save, sender=SeedImage)
+def count_new_seed(sender, instance, created, **kwargs):
+    # bulk_create sends no post_save; bulk_save_seeds counts those itself
+    if created:
+        stats.record_inserted([instance])
+
+
+@receiver(post_delete, sender=SeedImage)
+def uncount_deleted_seed(sender, instance, **kwargs):
+    stats.record_deleted(instance)
+
+
+@receiver(post_save, sender=SeedImage)
+def add_to_embedding_cache(sender, instance, created, **kwargs):
+    if created and embedding_cache.EMBEDDING_CACHE_ENABLED:
+        transaction.on_commit(lambda: embedding_cache.index.add([instance]))
+
+
+@receiver(post_delete, sender=SeedImage)
+def remove_from_embedding_cache(sender, instance, **kwargs):
+    if embedding_cache.EMBEDDING_CACHE_ENABLED:
+        seed_id = instance.pk  # cleared on the instance once the delete finishes
+        transaction.on_commit(lambda: embedding_cache.index.remove(seed_id))
@@ -0,0 +1,101 @@
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import SeedImage, SeedStat
+
+# Dashboard dimension -> SeedImage column it groups by
+DIMENSIONS = {
+    "class": "prediction",
+    "quality": "quality",
+    "chain": "blockchain_type",
+    "signer": "signer_name",
+}
+
+# Same test the dashboard has always used for "blockchain synced"
+SYNCED = Q(blockchain_tx_id__isnull=False) & ~Q(blockchain_tx_id="")
+
+
+def snapshot(seed):
+    """The fields of a seed the counters depend on; take one before changing them"""
+    state = {dimension: getattr(seed, column) or "" for dimension, column in DIMENSIONS.items()}
+    state["synced"] = bool(seed.blockchain_tx_id)
+    return state
+
+
+def _deltas(changes):
+    """{(dimension, key): (total, certified)} net change for [(before, after)] snapshots, zeros dropped"""
+    deltas = {}
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            keys = [("all", "")] + [(dimension, state[dimension]) for dimension in DIMENSIONS]
+            for key in keys:
+                total, certified = deltas.get(key, (0, 0))
+                deltas[key] = (total + sign, certified + sign * state["synced"])
+
+    return {key: delta for key, delta in deltas.items() if delta != (0, 0)}
+
+
+def record_changes(changes):
+    """Apply [(before, after)] seed snapshots to the counters; None means inserted/deleted.
+
+    Call inside the transaction that writes the seeds so both commit together.
+    """
+    deltas = _deltas(changes)
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        SeedStat.objects.bulk_create(
+            [SeedStat(dimension=dimension, key=key) for dimension, key in deltas],
+            ignore_conflicts=True,
+        )
+        # Fixed order so concurrent writers lock rows the same way round
+        for (dimension, key), (total, certified) in sorted(deltas.items()):
+            SeedStat.objects.filter(dimension=dimension, key=key).update(
+                total=F("total") + total, certified=F("certified") + certified
+            )
+
+
+def record_inserted(seeds):
+    record_changes([(None, snapshot(seed)) for seed in seeds])
+
+
+def record_deleted(seed):
+    record_changes([(snapshot(seed), None)])
+
+
+def rebuild():
+    """Recompute every counter from SeedImage, e.g. after edits made outside the app"""
+    overall = SeedImage.objects.aggregate(total=Count("id"), certified=Count("id", filter=SYNCED))
+    counters = {("all", ""): [overall["total"], overall["certified"]]}
+    for dimension, column in DIMENSIONS.items():
+        counts = SeedImage.objects.values(column).annotate(total=Count("id"), certified=Count("id", filter=SYNCED))
+        for row in counts:
+            # NULL and "" share a key
+            counter = counters.setdefault((dimension, row[column] or ""), [0, 0])
+            counter[0] += row["total"]
+            counter[1] += row["certified"]
+
+    with transaction.atomic():
+        SeedStat.objects.all().delete()
+        SeedStat.objects.bulk_create([
+            SeedStat(dimension=dimension, key=key, total=total, certified=certified)
+            for (dimension, key), (total, certified) in counters.items()
+        ])
+    return len(counters)
+
+
+def summary():
+    """All counters in one small query: overall totals plus a breakdown per dimension"""
+    data = {"total": 0, "blockchain_synced": 0}
+    data.update({f"by_{dimension}": {} for dimension in DIMENSIONS})
+
+    for stat in SeedStat.objects.all():
+        if stat.dimension == "all":
+            data["total"] = stat.total
+            data["blockchain_synced"] = stat.certified
+        elif stat.dimension in DIMENSIONS and stat.total:
+            data[f"by_{stat.dimension}"][stat.key] = {"total": stat.total, "certified": stat.certified}
+    return data
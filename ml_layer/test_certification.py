@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from . import certification
+
+
+def _response(status_code, data=None):
+    return SimpleNamespace(status_code=status_code, json=lambda: data)
+
+
+def _payload(seed_id):
+    return {
+        "seedId": str(seed_id),
+        "className": "intact_soybeans",
+        "hash": f"hash-{seed_id}",
+        "timestamp": "2024-05-01T00:00:00Z",
+        "signature": "00",
+        "publicKey": "00",
+        "signerName": "Green Valley Nursery",
+    }
+
+
+def _chain(batch=None, single=None, lookup=None):
+    """Fake outbound.post routing /certify/batch, /certify and /verify/batch to callables"""
+    routes = {"/certify/batch": batch, "/certify": single, "/verify/batch": lookup}
+
+    def post(url, **kwargs):
+        path = url[url.index("/", len("http://")):]
+        return routes[path](kwargs["json"])
+    return post
+
+
+def _fail(_):
+    raise requests.exceptions.ConnectionError("chain unreachable")
+
+
+class PostCertificationsTest(SimpleTestCase):
+    """Records a chain accepted are kept even when a follow-up request fails"""
+
+    def test_failed_lookup_keeps_batch_results(self):
+        """/verify/batch failing for the rejected records leaves the accepted ones intact"""
+        def batch(body):
+            return _response(200, {"type": "sawtooth", "results": [
+                {"seedId": record["seedId"], "success": record["seedId"] != "3", "transactionId": f"tx-{record['seedId']}"}
+                for record in body["records"]
+            ]})
+
+        with mock.patch.object(certification.outbound, "post", side_effect=_chain(batch=batch, lookup=_fail)):
+            accepted = certification._post_certifications("sawtooth", [_payload(1), _payload(2), _payload(3)])
+
+        self.assertEqual(sorted(accepted), ["1", "2"])
+        self.assertEqual(accepted["1"]["transactionId"], "tx-1")
+
+    def test_failed_single_request_keeps_the_others(self):
+        """Without a batch endpoint, one record's request raising doesn't drop the rest"""
+        def single(record):
+            if record["seedId"] == "2":
+                raise requests.exceptions.Timeout("slow peer")
+            return _response(200, {"seedId": record["seedId"], "transactionId": f"tx-{record['seedId']}", "type": "fabric"})
+
+        post = _chain(batch=lambda body: _response(404), single=single, lookup=_fail)
+        with mock.patch.object(certification.outbound, "post", side_effect=post):
+            accepted = certification._post_certifications("fabric", [_payload(1), _payload(2), _payload(3)])
+
+        self.assertEqual(sorted(accepted), ["1", "3"])
+
+    def test_only_unaccepted_seeds_fall_back(self):
+        """A failed lookup on the first chain sends just the rejected seed to the next one"""
+        seeds = [
+            SimpleNamespace(id=seed_id, blockchain_tx_id=None, blockchain_type=None, signer_name=None,
+                            certification_status="pending")
+            for seed_id in (1, 2, 3)
+        ]
+        sent = {}
+
+        def post_certifications(chain, payloads, heartbeat=None):
+            sent[chain] = [payload["seedId"] for payload in payloads]
+            batch = lambda body: _response(200, {"type": chain, "results": [
+                {"seedId": record["seedId"], "success": chain == "fabric" or record["seedId"] != "3",
+                 "transactionId": f"{chain}-{record['seedId']}"}
+                for record in body["records"]
+            ]})
+            with mock.patch.object(certification.outbound, "post", side_effect=_chain(batch=batch, lookup=_fail)):
+                return real_post_certifications(chain, payloads, heartbeat)
+
+        real_post_certifications = certification._post_certifications
+        with mock.patch.object(certification, "build_certification_payloads",
+                               return_value=[_payload(seed.id) for seed in seeds]), \
+                mock.patch.object(certification, "_post_certifications", side_effect=post_certifications), \
+                mock.patch.object(certification, "SeedImage"), \
+                mock.patch.object(certification, "stats"), \
+                mock.patch.object(certification, "chain_cache"), \
+                mock.patch.object(certification.transaction, "atomic"):
+            results = certification.submit_certifications(seeds, "sawtooth", "Nursery_A")
+
+        self.assertEqual(sent, {"sawtooth": ["1", "2", "3"], "fabric": ["3"]})
+        self.assertEqual(results, {1: None, 2: None, 3: None})
+        self.assertEqual([seed.blockchain_tx_id for seed in seeds], ["sawtooth-1", "sawtooth-2", "fabric-3"])
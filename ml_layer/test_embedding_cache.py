@@ -0,0 +1,140 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from . import embedding_cache
+
+
+def _vector(*hot):
+    vector = np.zeros(512, dtype=np.float32)
+    vector[list(hot)] = 1
+    return vector
+
+
+class FakeSeeds:
+    """Just enough of SeedImage.objects for EmbeddingIndex: {id: embedding} rows plus a query count"""
+
+    def __init__(self, rows, on_read=None):
+        self.rows = dict(rows)
+        self.on_read = on_read
+        self.queries = 0
+
+    def exclude(self, **lookups):
+        return self
+
+    def values_list(self, *fields, flat=False):
+        return self
+
+    def iterator(self, chunk_size=None):
+        self.queries += 1
+        for seed_id, embedding in sorted(self.rows.items()):
+            if self.on_read:
+                self.on_read(seed_id)
+            yield seed_id, embedding
+
+    def filter(self, id__gt=None, pk__in=None):
+        self.queries += 1
+        if id__gt is not None:
+            return FakeSelection(seed_id for seed_id in sorted(self.rows) if seed_id > id__gt)
+        return FakeSelection([SimpleNamespace(pk=seed_id, embedding=self.rows[seed_id]) for seed_id in pk__in])
+
+
+class FakeSelection(list):
+    def only(self, *fields):
+        return self
+
+    def values_list(self, *fields, flat=False):
+        return self
+
+
+class EmbeddingIndexTest(SimpleTestCase):
+    """Build/replay, add/remove, catch-up and search on the in-memory index"""
+
+    def _build(self, rows, on_read=None, index=None):
+        index = index or embedding_cache.EmbeddingIndex(300)
+        seeds = FakeSeeds(rows, on_read)
+        with mock.patch.object(embedding_cache.SeedImage, "objects", seeds):
+            index.build()
+        return index, seeds
+
+    def _ids(self, index):
+        return sorted(index.data[0].tolist())
+
+    def test_search_returns_top_k_within_threshold(self):
+        index, _ = self._build({1: _vector(0), 2: _vector(0, 1), 3: _vector(2)})
+
+        results = index.search([_vector(0), None, _vector(5)], threshold=0.5, k=2)
+
+        self.assertEqual([seed_id for seed_id, _ in results[0]], [1, 2])
+        self.assertAlmostEqual(results[0][0][1], 0, places=5)
+        self.assertAlmostEqual(results[0][1][1], 1 - 1 / np.sqrt(2), places=5)
+        self.assertEqual(results[1], [])
+        self.assertEqual(results[2], [])
+
+    def test_search_k_larger_than_index(self):
+        index, _ = self._build({1: _vector(0)})
+        self.assertEqual([seed_id for seed_id, _ in index.search([_vector(0)], threshold=2, k=5)[0]], [1])
+
+    def test_add_skips_known_ids_and_remove(self):
+        index, _ = self._build({1: _vector(0)})
+
+        index.add([SimpleNamespace(pk=1, embedding=_vector(3)), SimpleNamespace(pk=2, embedding=_vector(1)),
+                   SimpleNamespace(pk=3, embedding=None)])
+        self.assertEqual(self._ids(index), [1, 2])
+        self.assertEqual(index.search([_vector(0)], threshold=0.1)[0][0][0], 1)
+
+        index.remove(1)
+        self.assertEqual(self._ids(index), [2])
+        self.assertEqual(index.search([_vector(0)], threshold=0.1), [[]])
+
+    def test_changes_during_build_are_replayed(self):
+        """Seeds added or deleted while the build is reading rows survive its swap"""
+        index = embedding_cache.EmbeddingIndex(300)
+        index.add([SimpleNamespace(pk=2, embedding=_vector(2))])
+
+        def on_read(seed_id):
+            if seed_id == 1:
+                index.add([SimpleNamespace(pk=9, embedding=_vector(9))])
+                index.remove(2)
+
+        self._build({1: _vector(1), 2: _vector(2)}, on_read, index)
+
+        self.assertEqual(self._ids(index), [1, 9])
+        self.assertIsNone(index.changes)
+        # The replayed seed doesn't move the watermark past rows never read
+        self.assertEqual(index.watermark, 2)
+
+    def test_catch_up_loads_seeds_from_other_processes(self):
+        index, seeds = self._build({1: _vector(1), 2: _vector(2)})
+        index.add([SimpleNamespace(pk=3, embedding=_vector(3))])
+        seeds.rows.update({3: _vector(3), 4: _vector(4)})
+
+        with mock.patch.object(embedding_cache.SeedImage, "objects", seeds):
+            index.catch_up()
+            self.assertEqual(self._ids(index), [1, 2, 3, 4])
+            self.assertEqual(index.checked, {4})
+
+            # Nothing new: one range query, no reload
+            seeds.queries = 0
+            index.catch_up()
+            self.assertEqual(seeds.queries, 1)
+
+    def test_catch_up_is_rate_limited(self):
+        index, seeds = self._build({1: _vector(1)}, index=embedding_cache.EmbeddingIndex(300, catch_up_interval=60))
+        seeds.rows[2] = _vector(2)
+
+        with mock.patch.object(embedding_cache.SeedImage, "objects", seeds):
+            index.catch_up()
+            seeds.rows[3] = _vector(3)
+            seeds.queries = 0
+            index.catch_up()
+
+        self.assertEqual(seeds.queries, 0)
+        self.assertEqual(self._ids(index), [1, 2])
+
+        index.caught_up_at -= 60
+        with mock.patch.object(embedding_cache.SeedImage, "objects", seeds):
+            index.catch_up()
+        self.assertEqual(self._ids(index), [1, 2, 3])
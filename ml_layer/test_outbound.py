@@ -0,0 +1,140 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase
+
+from . import outbound
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    """closed -> open -> half-open -> closed (or back to open)"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(outbound.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = outbound.CircuitBreaker("test", threshold=3, cooldown=30)
+
+    def _open(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), "closed")
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), "open")
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_the_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), "closed")
+
+    def test_half_open_allows_one_trial(self):
+        self._open()
+        self.clock.now += 30
+        self.assertEqual(self.breaker.state(), "half_open")
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_successful_trial_closes(self):
+        self._open()
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state(), "closed")
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_trial_reopens_for_another_cooldown(self):
+        self._open()
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), "open")
+        self.clock.now += 29
+        self.assertFalse(self.breaker.allow())
+        self.clock.now += 1
+        self.assertTrue(self.breaker.allow())
+
+
+class GuardedRequestTest(SimpleTestCase):
+    """Whatever a guarded call raises, a half-open trial is finished and the breaker can recover"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(outbound.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        guard = outbound.CircuitBreaker("chain", threshold=1, cooldown=30)
+        breakers = mock.patch.dict(outbound._breakers, {"chain": guard})
+        breakers.start()
+        self.addCleanup(breakers.stop)
+        self.guard = guard
+
+    def _half_open(self):
+        self.guard.record_failure()
+        self.clock.now += 30
+
+    def test_sync_trial_raising_any_exception_reopens(self):
+        self._half_open()
+        session = mock.Mock()
+        session.request.side_effect = RuntimeError("session closed")
+        with mock.patch.object(outbound, "_session_for", return_value=session):
+            with self.assertRaises(RuntimeError):
+                outbound.get("http://chain/health", breaker_name="chain")
+
+            self.assertFalse(self.guard.trial_running)
+            self.clock.now += 30
+            session.request.side_effect = None
+            session.request.return_value = SimpleNamespace(status_code=200)
+            outbound.get("http://chain/health", breaker_name="chain")
+
+        self.assertEqual(self.guard.state(), "closed")
+
+    def test_open_breaker_skips_the_call(self):
+        self.guard.record_failure()
+        session = mock.Mock()
+        with mock.patch.object(outbound, "_session_for", return_value=session):
+            with self.assertRaises(outbound.CircuitOpenError):
+                outbound.post("http://chain/certify", breaker_name="chain")
+        session.request.assert_not_called()
+
+    def test_async_trial_raising_non_http_error_reopens(self):
+        self._half_open()
+        client = mock.Mock()
+        client.request = mock.AsyncMock(side_effect=httpx.InvalidURL("bad url"))
+        with mock.patch.object(outbound, "_async_client", return_value=client):
+            with self.assertRaises(httpx.InvalidURL):
+                asyncio.run(outbound.async_get("http://chain/verify/1", breaker_name="chain"))
+
+            self.assertFalse(self.guard.trial_running)
+            self.clock.now += 30
+            client.request = mock.AsyncMock(return_value=SimpleNamespace(status_code=404))
+            asyncio.run(outbound.async_get("http://chain/verify/1", breaker_name="chain"))
+
+        self.assertEqual(self.guard.state(), "closed")
+
+    def test_server_errors_count_as_failures(self):
+        session = mock.Mock()
+        session.request.return_value = SimpleNamespace(status_code=500)
+        with mock.patch.object(outbound, "_session_for", return_value=session):
+            outbound.get("http://chain/health", breaker_name="chain")
+        self.assertEqual(self.guard.state(), "open")
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.db.models import Q
+from django.test import SimpleTestCase
+
+from . import pagination
+
+
+class CursorTest(SimpleTestCase):
+    """Keyset cursors round-trip and reject anything they didn't produce"""
+
+    def test_round_trip(self):
+        uploaded_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        cursor = pagination.encode_cursor(uploaded_at, 42)
+        self.assertNotIn("=", cursor)
+        self.assertEqual(pagination.decode_cursor(cursor), (uploaded_at, 42))
+
+    def test_round_trip_keeps_offset(self):
+        uploaded_at = datetime(2024, 5, 1, 8, 0, tzinfo=timezone(timedelta(hours=-5)))
+        self.assertEqual(pagination.decode_cursor(pagination.encode_cursor(uploaded_at, 7))[0], uploaded_at)
+
+    def test_malformed_cursors(self):
+        for cursor in ["", "not a cursor", pagination.encode_cursor(datetime.now(timezone.utc), 1)[:-4], "WzEsMl0"]:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    pagination.decode_cursor(cursor)
+
+    def test_page_size(self):
+        self.assertEqual(pagination.page_size({}), pagination.DEFAULT_PAGE_SIZE)
+        self.assertEqual(pagination.page_size({"limit": "10"}), 10)
+        self.assertEqual(pagination.page_size({"limit": "100000"}), pagination.MAX_PAGE_SIZE)
+        for limit in ["0", "-3", "ten"]:
+            with self.subTest(limit=limit):
+                with self.assertRaises(ValueError):
+                    pagination.page_size({"limit": limit})
+
+
+class SeedPageTest(SimpleTestCase):
+    """seed_page orders by (uploaded_at, id) and resumes exactly after the cursor row"""
+
+    def _page(self, params, rows):
+        queryset = mock.MagicMock()
+        queryset.filter.return_value = queryset
+        queryset.order_by.return_value.values.return_value.__getitem__.return_value = rows
+        with mock.patch.object(pagination, "SeedImage"), \
+                mock.patch.object(pagination, "filter_seeds", return_value=queryset):
+            page = pagination.seed_page(params, ["prediction"])
+        return page, queryset
+
+    def test_cursor_breaks_ties_on_id(self):
+        """Seeds sharing the cursor's timestamp continue from the next lower id"""
+        uploaded_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        _, queryset = self._page({"cursor": pagination.encode_cursor(uploaded_at, 5)}, [])
+
+        self.assertEqual(
+            queryset.filter.call_args.args[0],
+            Q(uploaded_at__lt=uploaded_at) | Q(uploaded_at=uploaded_at, id__lt=5),
+        )
+        queryset.order_by.assert_called_once_with("-uploaded_at", "-id")
+
+    def test_next_cursor_points_at_last_row(self):
+        """One extra row is fetched to tell whether another page exists"""
+        uploaded_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        rows = [{"id": seed_id, "uploaded_at": uploaded_at, "prediction": "x"} for seed_id in (9, 8, 7)]
+
+        (page, next_cursor), queryset = self._page({"limit": "2"}, rows)
+
+        queryset.order_by.return_value.values.return_value.__getitem__.assert_called_once_with(slice(None, 3))
+        self.assertEqual([row["id"] for row in page], [9, 8])
+        self.assertEqual(pagination.decode_cursor(next_cursor), (uploaded_at, 8))
+
+    def test_last_page_has_no_cursor(self):
+        uploaded_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        rows = [{"id": 1, "uploaded_at": uploaded_at, "prediction": "x"}]
+        (page, next_cursor), _ = self._page({"limit": "2"}, rows)
+        self.assertEqual(len(page), 1)
+        self.assertIsNone(next_cursor)
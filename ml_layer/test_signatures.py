@@ -0,0 +1,141 @@
+import hashlib
+import importlib.util
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from . import ecdsa_backend
+
+CC_SIGNATURES = Path(__file__).resolve().parent.parent / "blockchain_sawtooth" / "cc" / "signatures.py"
+
+
+def _load_cc_signatures():
+    """The transaction processor's verify-only module, which lives outside any package"""
+    spec = importlib.util.spec_from_file_location("cc_signatures", CC_SIGNATURES)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+cc_signatures = _load_cc_signatures()
+
+
+def _cc_backends():
+    backends = {}
+    for factory in (cc_signatures._coincurve_backend, cc_signatures._cryptography_backend, cc_signatures._ecdsa_backend):
+        try:
+            name, load_public_key, verify = factory()
+        except ImportError:
+            continue
+        backends[name] = (load_public_key, verify)
+    return backends
+
+
+SIGNERS = {backend.name: backend for backend in ecdsa_backend.available_backends()}
+CC_BACKENDS = _cc_backends()
+
+
+def _seed_hash(label):
+    return hashlib.sha256(label.encode()).hexdigest()
+
+
+def _high_s(signature):
+    """The other valid encoding of the same signature, with s above n/2"""
+    r, s = ecdsa_backend._split_signature(signature)
+    if s <= ecdsa_backend.CURVE_ORDER // 2:
+        s = ecdsa_backend.CURVE_ORDER - s
+    return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+
+class SignatureMatrixTest(SimpleTestCase):
+    """Signatures made by any backend verify the same way in every backend, in the backend and on-chain"""
+
+    def _verifiers(self):
+        """(label, verify_signatures) for every installed backend in both modules"""
+        verifiers = [
+            (f"ml_layer/{name}", lambda batch, using=backend: ecdsa_backend.verify_signatures(batch, using=using))
+            for name, backend in SIGNERS.items()
+        ]
+        for name, (load_public_key, verify) in CC_BACKENDS.items():
+            verifiers.append((f"cc/{name}", self._cc_verifier(load_public_key, verify)))
+        return verifiers
+
+    def _cc_verifier(self, load_public_key, verify):
+        def verify_signatures(batch):
+            # Swap the module's backend for one call; parsed keys are cached per backend
+            cc_signatures._public_key.cache_clear()
+            with mock.patch.object(cc_signatures, "_load_public_key", load_public_key), \
+                    mock.patch.object(cc_signatures, "_verify", verify):
+                results = cc_signatures.verify_signatures(batch)
+            cc_signatures._public_key.cache_clear()
+            return results
+        return verify_signatures
+
+    def _signed(self, backend, label):
+        private_key = backend.load_private_key(backend.generate())
+        hash_hex = _seed_hash(label)
+        signature = backend.sign(private_key, bytes.fromhex(hash_hex))
+        return hash_hex, signature, backend.public_key_bytes(private_key).hex()
+
+    def test_every_backend_verifies_every_other(self):
+        """Sign with each backend, verify with each backend in both modules"""
+        for signer_name, signer in SIGNERS.items():
+            hash_hex, signature, public_key_hex = self._signed(signer, signer_name)
+            for verifier_name, verify_signatures in self._verifiers():
+                with self.subTest(signer=signer_name, verifier=verifier_name):
+                    self.assertEqual(
+                        verify_signatures([
+                            (hash_hex, signature.hex(), public_key_hex),
+                            (_seed_hash("other seed"), signature.hex(), public_key_hex),
+                        ]),
+                        [True, False],
+                    )
+
+    def test_high_s_signatures_verify(self):
+        """ecdsa makes high-S signatures; libsecp256k1 only accepts low-S ones unless normalised"""
+        if "ecdsa" not in SIGNERS:
+            self.skipTest("ecdsa is not installed")
+        if "coincurve" not in SIGNERS and "coincurve" not in CC_BACKENDS:
+            self.skipTest("coincurve is not installed")
+
+        hash_hex, signature, public_key_hex = self._signed(SIGNERS["ecdsa"], "high-s")
+        high_s = _high_s(signature)
+        for verifier_name, verify_signatures in self._verifiers():
+            with self.subTest(verifier=verifier_name):
+                self.assertEqual(verify_signatures([(hash_hex, high_s.hex(), public_key_hex)]), [True])
+
+    def test_tampered_signature_fails(self):
+        """A flipped bit or a truncated signature is rejected, never raised"""
+        for signer_name, signer in SIGNERS.items():
+            hash_hex, signature, public_key_hex = self._signed(signer, signer_name)
+            flipped = bytearray(signature)
+            flipped[40] ^= 0x01
+            for verifier_name, verify_signatures in self._verifiers():
+                with self.subTest(signer=signer_name, verifier=verifier_name):
+                    self.assertEqual(
+                        verify_signatures([
+                            (hash_hex, bytes(flipped).hex(), public_key_hex),
+                            (hash_hex, signature[:63].hex(), public_key_hex),
+                            (hash_hex, bytes(64).hex(), public_key_hex),
+                            (hash_hex, "not hex", public_key_hex),
+                        ]),
+                        [False, False, False, False],
+                    )
+
+    def test_malformed_public_key_fails(self):
+        """Keys off the curve, of the wrong length or not hex are rejected, never raised"""
+        signer = next(iter(SIGNERS.values()))
+        hash_hex, signature, public_key_hex = self._signed(signer, "malformed key")
+        off_curve = (bytes(63) + b"\x01").hex()
+        for verifier_name, verify_signatures in self._verifiers():
+            with self.subTest(verifier=verifier_name):
+                self.assertEqual(
+                    verify_signatures([
+                        (hash_hex, signature.hex(), off_curve),
+                        (hash_hex, signature.hex(), public_key_hex[:-2]),
+                        (hash_hex, signature.hex(), "zz" * 64),
+                        (hash_hex, signature.hex(), public_key_hex),
+                    ]),
+                    [False, False, False, True],
+                )
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from . import stats
+
+
+def _seed(**fields):
+    values = {
+        "prediction": "intact_soybeans",
+        "quality": "High",
+        "blockchain_type": None,
+        "signer_name": None,
+        "blockchain_tx_id": None,
+    }
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+class SeedStatDeltaTest(SimpleTestCase):
+    """Counter deltas for inserts, deletes and certifications"""
+
+    def test_insert_counts_every_dimension(self):
+        """A new uncertified seed adds one to its row in each dimension"""
+        deltas = stats._deltas([(None, stats.snapshot(_seed()))])
+        self.assertEqual(deltas, {
+            ("all", ""): (1, 0),
+            ("class", "intact_soybeans"): (1, 0),
+            ("quality", "High"): (1, 0),
+            ("chain", ""): (1, 0),
+            ("signer", ""): (1, 0),
+        })
+
+    def test_delete_certified_seed(self):
+        """Deleting a certified seed takes it off both the total and the certified count"""
+        seed = _seed(blockchain_type="sawtooth", signer_name="Green Valley Nursery", blockchain_tx_id="abc")
+        deltas = stats._deltas([(stats.snapshot(seed), None)])
+        self.assertEqual(deltas, {
+            ("all", ""): (-1, -1),
+            ("class", "intact_soybeans"): (-1, -1),
+            ("quality", "High"): (-1, -1),
+            ("chain", "sawtooth"): (-1, -1),
+            ("signer", "Green Valley Nursery"): (-1, -1),
+        })
+
+    def test_certify_moves_chain_and_signer(self):
+        """Certifying keeps totals, bumps certified, and moves the seed to its chain and signer"""
+        seed = _seed()
+        before = stats.snapshot(seed)
+        seed.blockchain_type = "fabric"
+        seed.signer_name = "Palm Paradise Seeds"
+        seed.blockchain_tx_id = "tx-1"
+        deltas = stats._deltas([(before, stats.snapshot(seed))])
+        self.assertEqual(deltas, {
+            ("all", ""): (0, 1),
+            ("class", "intact_soybeans"): (0, 1),
+            ("quality", "High"): (0, 1),
+            ("chain", ""): (-1, 0),
+            ("chain", "fabric"): (1, 1),
+            ("signer", ""): (-1, 0),
+            ("signer", "Palm Paradise Seeds"): (1, 1),
+        })
+
+    def test_changes_in_one_batch_net_out(self):
+        """Unchanged seeds and an insert cancelled by a delete produce no deltas"""
+        seed = _seed(quality="Low")
+        snapshot = stats.snapshot(seed)
+        self.assertEqual(stats._deltas([(snapshot, snapshot), (None, snapshot), (snapshot, None)]), {})
+
+    def test_empty_tx_id_is_not_synced(self):
+        """An empty tx id counts as uncertified, like the SYNCED filter"""
+        self.assertFalse(stats.snapshot(_seed(blockchain_tx_id=""))["synced"])
+
+    def test_record_changes_updates_in_key_order(self):
+        """Rows are created if missing, then updated in sorted order so writers lock alike"""
+        seed = _seed()
+        before = stats.snapshot(seed)
+        seed.blockchain_type = "sawtooth"
+        seed.signer_name = "Tropical Seed Co."
+        seed.blockchain_tx_id = "tx-2"
+
+        with mock.patch.object(stats, "SeedStat") as seed_stat, mock.patch.object(stats.transaction, "atomic"):
+            stats.record_changes([(before, stats.snapshot(seed))])
+
+        created = seed_stat.objects.bulk_create.call_args
+        self.assertTrue(created.kwargs["ignore_conflicts"])
+        self.assertEqual(len(created.args[0]), 7)
+        updated = [(call.kwargs["dimension"], call.kwargs["key"]) for call in seed_stat.objects.filter.call_args_list]
+        self.assertEqual(updated, sorted(stats._deltas([(before, stats.snapshot(seed))])))
+
+    def test_record_changes_without_deltas_skips_the_database(self):
+        with mock.patch.object(stats, "SeedStat") as seed_stat:
+            stats.record_changes([])
+        seed_stat.objects.bulk_create.assert_not_called()
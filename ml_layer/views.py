@@ -1,70 +1,236 @@
+import asyncio
+import httpx
 import requests
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from .models import SeedImage
-from dotenv import load_dotenv
+from .models import SeedImage, CertificationJob
 import os
 import base64
 from . import feature_hasher
+from . import embedding_cache
+from . import certification
+from . import chain_cache
+from . import outbound
+from . import export
+from . import stats
+from .certification import BLOCKCHAIN_TYPE, compute_seed_hash
 from PIL import Image, ImageDraw, ImageFont
 import io
-import hashlib
 import json
-from pgvector.django import CosineDistance
-
-load_dotenv()
+import time
+import numpy as np
+from .search import find_similar_seeds, find_similar_in_batch
+from .pagination import seed_page, filter_seeds
+from django.core.files.base import ContentFile
+from django.db import transaction
 
 # ML Server URL (from environment or default to localhost for local dev)
 COLAB_URL = os.getenv("url", "http://localhost:8001")
 
-BLOCKCHAIN_TYPE = {
-    "fabric": os.getenv("FABRIC_URL", "http://localhost:3000"),
-    "sawtooth": os.getenv("SAWTOOTH_URL", "http://localhost:9000")
-}
-
 ML_API_KEY = os.getenv('ML_API_KEY', 'default-dev-key')
 
+# Embeddings are requested as base64 float32 buffers instead of JSON float lists.
+# float32 matches pgvector's storage precision, so seed hashes stay stable.
+EMBEDDING_FORMAT = "float32"
+EMBEDDING_DTYPES = {"float32": "<f4", "float16": "<f2"}
+
+# Chain lookups during verify run in parallel under one overall deadline
+VERIFY_TIMEOUT = 10
+VERIFY_DEADLINE = float(os.getenv("VERIFY_DEADLINE", "12"))
+VERIFY_MAX_WORKERS = int(os.getenv("VERIFY_MAX_WORKERS", "16"))
+
 
 # ============== Helper Functions ==============
 
-def get_inference(image_file):
+def decode_embedding(value, embedding_format):
+    """Decode an embedding from the ML server response into a float32 NumPy vector"""
+    if value is None:
+        return None
+    if embedding_format == "list":
+        return np.asarray(value, dtype=np.float32)
+    embedding = np.frombuffer(base64.b64decode(value), dtype=EMBEDDING_DTYPES[embedding_format])
+    return embedding.astype(np.float32, copy=False)
+
+
+async def get_inference(image_file):
     """Call ML server for inference and return detections"""
-    files = {"file": image_file}
-    headers = {"X-API-Key": ML_API_KEY}
-    response = requests.post(f"{COLAB_URL}/predict/", files=files, headers=headers, timeout=30)
+    files = {"file": (image_file.name, image_file.read(), image_file.content_type)}
+    # Crops are cut locally from the upload (see crop_detections), so ask for bboxes only
+    headers = {
+        "X-API-Key": ML_API_KEY,
+        "X-Embedding-Format": EMBEDDING_FORMAT,
+        "X-Include-Crops": "false",
+    }
+    response = await outbound.async_post(f"{COLAB_URL}/predict/", files=files, headers=headers, timeout=30)
     response.raise_for_status()
 
     data = response.json()
     detections = data.get("results", [])
+    embedding_format = data.get("embedding_format", "list")
+    for detection in detections:
+        detection["embedding"] = decode_embedding(detection.get("embedding"), embedding_format)
     processing_time = data.get("processing_time_ms")
     image_size = data.get("image_size", {})
 
     return detections, processing_time, image_size
 
 
-def compute_seed_hash(embedding, confidence, quality):
-    """Compute SHA256 hash of seed data for blockchain"""
-    # Handle numpy arrays
-    if hasattr(embedding, 'tolist'):
-        embedding = embedding.tolist()
-    elif embedding is None:
-        embedding = []
+async def _fetch_chain_record(chain, seed_id):
+    """Fetch one seed record from a chain client, or None if it isn't there.
 
-    data = {
-        "embedding": embedding,
-        "confidence": confidence,
-        "quality": quality
+    Raises for any other failure, so it is never cached as "not on chain".
+    """
+    url = BLOCKCHAIN_TYPE[chain]
+    response = await outbound.async_get(f"{url}/verify/{seed_id}", breaker_name=chain, timeout=VERIFY_TIMEOUT)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
+
+async def _fetch_chain_records_batch(chain, seed_ids):
+    """Fetch many seed records from a chain client in one call.
+
+    Returns {seed_id: record or None}, or None if the client has no batch endpoint.
+    """
+    url = BLOCKCHAIN_TYPE[chain]
+    response = await outbound.async_post(
+        f"{url}/verify/batch",
+        breaker_name=chain,
+        json={"seedIds": [str(seed_id) for seed_id in seed_ids]},
+        timeout=VERIFY_TIMEOUT,
+    )
+    if response.status_code in (404, 405):
+        return None
+    response.raise_for_status()
+
+    records = response.json().get("records", {})
+    return {seed_id: records.get(str(seed_id)) for seed_id in seed_ids}
+
+
+async def fetch_chain_records(seed_ids):
+    """Look up seed records on every chain concurrently, within VERIFY_DEADLINE seconds overall.
+
+    Answers already in the local chain cache are reused. For the rest, each
+    chain gets one /verify/batch call; chains without it get one lookup per
+    seed. Returns ({(chain, seed_id): record or None}, {(chain, seed_id)
+    that missed the deadline}, {(chain, seed_id) whose lookup failed}).
+    Lookups still running at the deadline are cancelled, so a slow chain
+    yields partial results instead of stalling the request.
+    """
+    if not seed_ids:
+        return {}, set(), set()
+
+    cached = await sync_to_async(chain_cache.get_cached)(
+        [(chain, seed_id) for chain in BLOCKCHAIN_TYPE for seed_id in seed_ids]
+    )
+    chain_ids = {
+        chain: [seed_id for seed_id in seed_ids if (chain, seed_id) not in cached]
+        for chain in BLOCKCHAIN_TYPE
     }
-    return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+    chain_ids = {chain: ids for chain, ids in chain_ids.items() if ids}
+    if not chain_ids:
+        return cached, set(), set()
 
+    deadline = time.monotonic() + VERIFY_DEADLINE
+    slots = asyncio.Semaphore(VERIFY_MAX_WORKERS)
 
-def find_similar_seed(embedding, threshold=0.1):
-    """Find similar seed by embedding with configurable threshold"""
-    return SeedImage.objects.annotate(
-        distance=CosineDistance('embedding', embedding)
-    ).filter(distance__lt=threshold).order_by('distance').first()
+    async def limited(lookup, *args):
+        async with slots:
+            return await lookup(*args)
+
+    # (chain, None) marks a whole-chain batch lookup
+    tasks = {
+        asyncio.create_task(limited(_fetch_chain_records_batch, chain, ids)): (chain, None)
+        for chain, ids in chain_ids.items()
+    }
+    pending = set(tasks)
+    fetched = {}
+    failed = set()
+
+    while pending:
+        done, pending = await asyncio.wait(
+            pending, timeout=max(0, deadline - time.monotonic()), return_when=asyncio.FIRST_COMPLETED
+        )
+        if not done:
+            break
+
+        for task in done:
+            chain, seed_id = tasks[task]
+            try:
+                result = task.result()
+            except Exception as e:
+                # Errors are not answers; leave them out so they aren't cached
+                print(f"Blockchain {chain} lookup failed: {e}")
+                failed.update([(chain, seed_id)] if seed_id is not None else [(chain, other_id) for other_id in chain_ids[chain]])
+                continue
+
+            if seed_id is not None:
+                fetched[(chain, seed_id)] = result
+            elif result is None:
+                # Chain client without /verify/batch: one lookup per seed
+                for other_id in chain_ids[chain]:
+                    single = asyncio.create_task(limited(_fetch_chain_record, chain, other_id))
+                    tasks[single] = (chain, other_id)
+                    pending.add(single)
+            else:
+                fetched.update({(chain, other_id): record for other_id, record in result.items()})
+
+    timed_out = set()
+    for task in pending:
+        task.cancel()
+        chain, seed_id = tasks[task]
+        timed_out.update([(chain, seed_id)] if seed_id is not None else [(chain, other_id) for other_id in chain_ids[chain]])
+    if timed_out:
+        print(f"Chain verification deadline hit: {len(timed_out)} lookups abandoned")
+
+    await sync_to_async(chain_cache.store)(fetched)
+
+    return {**cached, **fetched}, timed_out, failed
+
+
+def bulk_save_seeds(seeds, files):
+    """Write all crop files to storage, then insert every seed in one transaction"""
+    written = []
+    try:
+        for seed, cropped_file in zip(seeds, files):
+            seed.image.save(cropped_file.name, cropped_file, save=False)
+            written.append(seed.image)
+
+        with transaction.atomic():
+            SeedImage.objects.bulk_create(seeds)
+            stats.record_inserted(seeds)
+            # bulk_create sends no post_save, so feed the embedding cache directly
+            if embedding_cache.EMBEDDING_CACHE_ENABLED:
+                transaction.on_commit(lambda: embedding_cache.index.add(seeds))
+    except Exception:
+        # Don't leave orphaned crop files behind if the insert fails
+        for field_file in written:
+            field_file.storage.delete(field_file.name)
+        raise
+
+    return seeds
+
+
+def crop_detections(image_file, detections):
+    """Crop each detection's bbox from the uploaded image, returning JPEG bytes per detection"""
+    image_file.seek(0)
+    img = Image.open(image_file).convert('RGB')
+
+    crops = []
+    for detection in detections:
+        bbox = detection.get("bbox")
+        if not bbox:
+            crops.append(None)
+            continue
+        buffer = io.BytesIO()
+        img.crop(tuple(int(v) for v in bbox)).save(buffer, format='JPEG')
+        crops.append(buffer.getvalue())
+
+    return crops
 
 
 def create_annotated_image(image_file, detections):
@@ -92,7 +258,7 @@ def create_annotated_image(image_file, detections):
 
 
 @csrf_exempt
-def upload_seed(request):
+async def upload_seed(request):
     """Upload seed image and get YOLO + CNN predictions from Colab"""
     if request.method == "POST":
         image = request.FILES.get("image")
@@ -102,43 +268,55 @@ def upload_seed(request):
 
         try:
             # Send to FastAPI inference server (ngrok URL)
-            detections, processing_time, image_size = get_inference(image)
+            detections, processing_time, image_size = await get_inference(image)
 
             if not detections:
                 return JsonResponse({"error": "No seeds detected in image"}, status=400)
 
             saved_seeds = []
+            crops = await sync_to_async(crop_detections, thread_sensitive=False)(image, detections)
+
+            # Duplicate check for every detection in one query
+            matches = await sync_to_async(find_similar_seeds)(
+                [d.get("embedding") for d in detections], threshold=0.01
+            )
+
+            # New records are collected here and inserted together after the loop
+            new_seeds = []
+            new_files = []
+            new_embeddings = []
+            batch_duplicates = []  # (response entry, index into new_seeds)
 
             # Loop through ALL detections instead of just first one
-            for detection in detections:
+            for detection, cropped_data, match in zip(detections, crops, matches):
                 # Check for duplicate
-                new_embedding = detection.get("embedding")
-                if new_embedding:
-                    existing_seed = find_similar_seed(new_embedding, threshold=0.01)
-
-                    if existing_seed:
-                        saved_seeds.append({
-                            "status": "duplicate",
-                            "existing_seed_id": existing_seed.id,
-                            "bbox": detection.get("bbox")
-                        })
-                        continue
-
-                # Decode cropped image from base64
-                from django.core.files.base import ContentFile
-                cropped_b64 = detection.get("cropped_image")
-
-                if not cropped_b64:
-                    # ML server didn't return cropped image, skip this detection
+                if match:
+                    existing_seed, _ = match[0]
+                    saved_seeds.append({
+                        "status": "duplicate",
+                        "existing_seed_id": existing_seed.id,
+                        "bbox": detection.get("bbox")
+                    })
+                    continue
+
+                if not cropped_data:
+                    # Detection has no bbox to crop, skip it
                     continue
 
-                cropped_data = base64.b64decode(cropped_b64)
-                cropped_file = ContentFile(cropped_data, name=f"crop_{image.name}")
+                # Near-identical seed earlier in this same upload
+                twin = find_similar_in_batch(detection.get("embedding"), new_embeddings, threshold=0.01)
+                if twin is not None:
+                    entry = {"status": "duplicate", "existing_seed_id": None, "bbox": detection.get("bbox")}
+                    saved_seeds.append(entry)
+                    batch_duplicates.append((entry, twin))
+                    continue
 
                 # Save each seed as separate record with cropped image
-                seed_record = SeedImage.objects.create(
-                    image=cropped_file,  # Save the cropped image, not original
-                    detections=[detection],
+                # The vector lives in the embedding column; keep it out of the JSON copy
+                detection_json = {k: v for k, v in detection.items() if k != "embedding"}
+
+                seed_record = SeedImage(
+                    detections=[detection_json],
                     processing_time_ms=processing_time,
                     image_width=image_size.get("width"),
                     image_height=image_size.get("height"),
@@ -149,19 +327,34 @@ def upload_seed(request):
                     quality=detection.get("quality"),
                     embedding=detection.get("embedding"),
                 )
+                new_seeds.append(seed_record)
+                new_files.append(ContentFile(cropped_data, name=f"crop_{image.name}"))  # Cropped image, not original
+                new_embeddings.append(detection.get("embedding"))
 
                 saved_seeds.append({
                     "status": "saved",
-                    "id": seed_record.id,
+                    "seed": seed_record,
                     "bbox": detection.get("bbox"),
                     "class": detection.get("class"),
                     "confidence": detection.get("confidence"),
-                    "image_url": seed_record.image.url
                 })
 
+            await sync_to_async(bulk_save_seeds)(new_seeds, new_files)
+
+            # Ids exist only after the insert
+            for entry in saved_seeds:
+                seed_record = entry.pop("seed", None)
+                if seed_record is not None:
+                    entry["id"] = seed_record.id
+                    entry["image_url"] = seed_record.image.url
+            for entry, twin in batch_duplicates:
+                entry["existing_seed_id"] = new_seeds[twin].id
+
             # Create annotated image with bounding boxes
             image.seek(0)  # Reset file pointer
-            annotated_image_b64 = create_annotated_image(image, detections)
+            annotated_image_b64 = await sync_to_async(create_annotated_image, thread_sensitive=False)(
+                image, detections
+            )
 
             return JsonResponse({
                 "seeds": saved_seeds,
@@ -173,97 +366,130 @@ def upload_seed(request):
                 "annotated_image": annotated_image_b64,
             })
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, httpx.HTTPError) as e:
             return JsonResponse({"error": str(e)}, status=500)
 
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
 
 @csrf_exempt
-def certify_seed(request):
-    """Certify a seed and write to blockchain (FR-4)"""
+async def certify_seed(request):
+    """Queue a seed for blockchain certification (FR-4); poll certify_status for the result"""
     if request.method == "POST":
         seed_id = request.POST.get("seed_id")
         blockchain_type = request.POST.get("blockchain_type", "fabric")
+        signer_id = request.POST.get("signer_id", "Nursery_A")
+
+        if signer_id not in feature_hasher.SIGNERS:
+            return JsonResponse({"error": f"Invalid signer: Unknown signer: {signer_id}"}, status=400)
 
         try:
-            seed = SeedImage.objects.get(id=seed_id)
+            seed = await SeedImage.objects.aget(id=seed_id)
+        except (SeedImage.DoesNotExist, ValueError):
+            return JsonResponse({"error": "Seed not found"}, status=404)
 
-            try:
-                from datetime import datetime, timezone
-
-                seed_hash = compute_seed_hash(seed.embedding, seed.confidence, seed.quality)
-
-                blockchain_payload = {
-                    "seedId": str(seed.id),
-                    "className": seed.prediction,
-                    "hash": seed_hash,
-                    "timestamp": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
-                }
-
-                signer_id = request.POST.get("signer_id", "Nursery_A")
-                new_hash = blockchain_payload["hash"]
-
-                try:
-                    signature_hex, public_key_hex, signer_name = feature_hasher.sign_hash(new_hash, signer_id)
-                    blockchain_payload["signature"] = signature_hex
-                    blockchain_payload["publicKey"] = public_key_hex
-                    blockchain_payload["signerName"] = signer_name
-                except ValueError as e:
-                    return JsonResponse({"error": f"Invalid signer: {str(e)}"}, status=400)
-
-                url_1 = BLOCKCHAIN_TYPE.get(blockchain_type)
-                url_2 = [url for key, url in BLOCKCHAIN_TYPE.items() if key != blockchain_type]
-
-                try:
-                    response = requests.post(f"{url_1}/certify", json=blockchain_payload, timeout=70)
-                    if response.status_code == 200:
-                        tx_data = response.json()
-                        seed.blockchain_tx_id = tx_data.get("transactionId")
-                        seed.blockchain_type = tx_data.get("type")
-                        seed.signer_name = signer_name
-                        seed.save()
-                        print(f"Certified on blockchain: {seed.blockchain_type} ({url_1})")
-                        return JsonResponse({
-                            "success": True,
-                            "seed_id": seed.id,
-                            "blockchain_tx_id": seed.blockchain_tx_id,
-                            "blockchain_type": seed.blockchain_type
-                        })
-                except Exception as e:
-                    print(f"Blockchain {blockchain_type} failed: {e}, trying fallback")
-                    for url in url_2:
-                        try:
-                            response = requests.post(f"{url}/certify", json=blockchain_payload, timeout=70)
-                            if response.status_code == 200:
-                                tx_data = response.json()
-                                seed.blockchain_tx_id = tx_data.get("transactionId")
-                                seed.blockchain_type = tx_data.get("type")
-                                seed.signer_name = signer_name
-                                seed.save()
-                                print(f"Certified on blockchain: {seed.blockchain_type} ({url})")
-                                return JsonResponse({
-                                    "success": True,
-                                    "seed_id": seed.id,
-                                    "blockchain_tx_id": seed.blockchain_tx_id,
-                                    "blockchain_type": seed.blockchain_type
-                                })
-                        except Exception as e:
-                            print(f"Blockchain {url} failed: {e}")
-                            continue
-
-                return JsonResponse({"error": "All blockchain certifications failed"}, status=500)
-            except Exception as e:
-                return JsonResponse({"error": f"Blockchain certification failed: {str(e)}"}, status=500)
+        job = await sync_to_async(certification.enqueue_certification)(seed, blockchain_type, signer_id)
+
+        return JsonResponse({
+            "success": True,
+            "job_id": job.id,
+            "seed_id": seed.id,
+            "status": job.status,
+        }, status=202)
 
-        except SeedImage.DoesNotExist:
+    return JsonResponse({"error": "Method not allowed"}, status=405)
+
+
+@csrf_exempt
+def certify_bulk(request):
+    """Queue many seeds for certification at once: a list of seed_ids, or every seed from an original_image_path.
+
+    The worker sends queued seeds to the chain clients in batches. GET with
+    ?job_ids=1,2,3 returns the per-seed status of those jobs.
+    """
+    if request.method == "GET":
+        try:
+            job_ids = [int(job_id) for job_id in request.GET.get("job_ids", "").split(",") if job_id]
+        except ValueError:
+            return JsonResponse({"error": "job_ids must be integers"}, status=400)
+        jobs = CertificationJob.objects.filter(pk__in=job_ids).order_by("id")
+        return JsonResponse({"results": [certification.job_to_dict(job) for job in jobs]})
+
+    if request.method == "POST":
+        if request.content_type == "application/json":
+            try:
+                params = json.loads(request.body or b"{}")
+            except ValueError:
+                return JsonResponse({"error": "Invalid JSON body"}, status=400)
+            if not isinstance(params, dict):
+                return JsonResponse({"error": "JSON body must be an object"}, status=400)
+            seed_ids = params.get("seed_ids") or []
+            if not isinstance(seed_ids, list):
+                return JsonResponse({"error": "seed_ids must be a list"}, status=400)
+        else:
+            params = request.POST
+            seed_ids = request.POST.getlist("seed_ids")
+
+        original_image_path = params.get("original_image_path")
+        blockchain_type = params.get("blockchain_type", "fabric")
+        signer_id = params.get("signer_id", "Nursery_A")
+
+        for name, value in (("original_image_path", original_image_path), ("blockchain_type", blockchain_type),
+                            ("signer_id", signer_id)):
+            if value is not None and not isinstance(value, str):
+                return JsonResponse({"error": f"{name} must be a string"}, status=400)
+        if signer_id not in feature_hasher.SIGNERS:
+            return JsonResponse({"error": f"Invalid signer: Unknown signer: {signer_id}"}, status=400)
+        if not seed_ids and not original_image_path:
+            return JsonResponse({"error": "seed_ids or original_image_path required"}, status=400)
+
+        if seed_ids:
+            # int() would also accept true and 1.5
+            if any(isinstance(seed_id, (bool, float)) for seed_id in seed_ids):
+                return JsonResponse({"error": "seed_ids must be integers"}, status=400)
+            try:
+                seed_ids = [int(seed_id) for seed_id in seed_ids]
+            except (TypeError, ValueError):
+                return JsonResponse({"error": "seed_ids must be integers"}, status=400)
+            found = SeedImage.objects.in_bulk(seed_ids)
+            seeds = [found[seed_id] for seed_id in dict.fromkeys(seed_ids) if seed_id in found]
+            missing = [seed_id for seed_id in seed_ids if seed_id not in found]
+        else:
+            seeds = list(SeedImage.objects.filter(original_image_path=original_image_path).order_by("id"))
+            missing = []
+
+        if not seeds:
             return JsonResponse({"error": "Seed not found"}, status=404)
 
+        jobs = certification.enqueue_certifications(seeds, blockchain_type, signer_id)
+
+        return JsonResponse({
+            "success": True,
+            "results": [
+                {"seed_id": job.seed_id, "job_id": job.id, "status": job.status}
+                for job in jobs
+            ] + [
+                {"seed_id": seed_id, "status": "not_found"}
+                for seed_id in missing
+            ],
+            "total_queued": len(jobs),
+        }, status=202)
+
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
 
+def certify_status(request, job_id):
+    """API: Return the status of a certification job"""
+    try:
+        job = CertificationJob.objects.get(pk=job_id)
+    except CertificationJob.DoesNotExist:
+        return JsonResponse({"error": "Job not found"}, status=404)
+
+    return JsonResponse(certification.job_to_dict(job))
+
+
 @csrf_exempt
-def verify_seed(request):
+async def verify_seed(request):
     """Verify seed authenticity against blockchain using embedding similarity (FR-6)"""
     if request.method == "POST":
         image = request.FILES.get("image")
@@ -273,31 +499,43 @@ def verify_seed(request):
 
         try:
             # Run inference to detect all seeds
-            detections, processing_time, image_size = get_inference(image)
+            detections, processing_time, image_size = await get_inference(image)
 
             if not detections:
                 return JsonResponse({"error": "No seeds detected in image"}, status=400)
 
-            from django.core.files.base import ContentFile
-
             verified_seeds = []
+            crops = await sync_to_async(crop_detections, thread_sensitive=False)(image, detections)
+
+            # Search database for similar seeds, all detections in one query
+            matches = await sync_to_async(find_similar_seeds)(
+                [d.get("embedding") for d in detections], threshold=0.1
+            )
+
+            # Look up every matched seed on every chain concurrently
+            matched_ids = {match[0][0].id for match in matches if match}
+            chain_records, timed_out, failed = await fetch_chain_records(matched_ids)
+
+            # Check the signer's ECDSA signature on every record that carries one, in one batch
+            signed = [
+                (key, record) for key, record in chain_records.items()
+                if record and record.get("signature") and record.get("publicKey") and record.get("hash")
+            ]
+            signature_valid = await sync_to_async(feature_hasher.verify_signatures, thread_sensitive=False)(
+                [(record["hash"], record["signature"], record["publicKey"]) for _, record in signed]
+            )
+            signature_checks = {key: valid for (key, _), valid in zip(signed, signature_valid)}
 
             # Process each detection
-            for detection in detections:
+            for detection, cropped_data, match in zip(detections, crops, matches):
                 new_embedding = detection.get("embedding")
-                cropped_b64 = detection.get("cropped_image")
 
-                if not new_embedding or not cropped_b64:
+                if new_embedding is None or not cropped_data:
                     continue
 
-                # Search database for similar seed
-                similar_seed = find_similar_seed(new_embedding, threshold=0.1)
+                cropped_b64 = base64.b64encode(cropped_data).decode('utf-8')
 
-                # Decode and store cropped image temporarily
-                cropped_data = base64.b64decode(cropped_b64)
-                cropped_file = ContentFile(cropped_data, name=f"verify_crop.jpg")
-
-                if not similar_seed:
+                if not match:
                     # No match found
                     verified_seeds.append({
                         "status": "not_found",
@@ -308,6 +546,8 @@ def verify_seed(request):
                     })
                     continue
 
+                similar_seed, distance = match[0]
+
                 # Compute hash for blockchain comparison
                 new_hash = compute_seed_hash(
                     new_embedding,
@@ -318,24 +558,26 @@ def verify_seed(request):
                 blockchain_results = {}
 
                 # Check all available blockchains
-                for blockchain_name, url in BLOCKCHAIN_TYPE.items():
-                    try:
-                        bc_response = requests.get(f"{url}/verify/{similar_seed.id}", timeout=10)
-                        if bc_response.status_code == 200:
-                            stored_record = bc_response.json()
-                            # Use tx_id from database if blockchain client doesn't return it
-                            tx_id = stored_record.get("transactionId") or similar_seed.blockchain_tx_id
-                            blockchain_results[blockchain_name] = {
-                                "found": True,
-                                "certified": stored_record["hash"] == new_hash,
-                                "tx_id": tx_id,
-                                "timestamp": stored_record["timestamp"],
-                                "signer_name": stored_record.get("signerName")
-                            }
-                        else:
-                            blockchain_results[blockchain_name] = {"found": False, "certified": False}
-                    except Exception as e:
+                for blockchain_name in BLOCKCHAIN_TYPE:
+                    stored_record = chain_records.get((blockchain_name, similar_seed.id))
+                    if stored_record:
+                        # Use tx_id from database if blockchain client doesn't return it
+                        tx_id = stored_record.get("transactionId") or similar_seed.blockchain_tx_id
+                        blockchain_results[blockchain_name] = {
+                            "found": True,
+                            "certified": stored_record.get("hash") == new_hash,
+                            "tx_id": tx_id,
+                            "timestamp": stored_record.get("timestamp"),
+                            "signer_name": stored_record.get("signerName"),
+                            # None when the chain doesn't store the signature
+                            "signature_valid": signature_checks.get((blockchain_name, similar_seed.id)),
+                        }
+                    else:
                         blockchain_results[blockchain_name] = {"found": False, "certified": False}
+                        if (blockchain_name, similar_seed.id) in timed_out:
+                            blockchain_results[blockchain_name]["timed_out"] = True
+                        elif (blockchain_name, similar_seed.id) in failed:
+                            blockchain_results[blockchain_name]["error"] = True
 
                 # Determine overall status
                 has_blockchain = any(bc["found"] for bc in blockchain_results.values())
@@ -353,7 +595,7 @@ def verify_seed(request):
                     "seed_id": similar_seed.id,
                     "class": similar_seed.prediction,
                     "confidence": detection.get("confidence"),
-                    "similarity": float(1 - similar_seed.distance),
+                    "similarity": float(1 - distance),
                     "cropped_image": cropped_b64,
                     "signer_name": similar_seed.signer_name,
                     "blockchains": blockchain_results
@@ -361,7 +603,9 @@ def verify_seed(request):
 
             # Create annotated image with bounding boxes
             image.seek(0)  # Reset file pointer
-            annotated_image_b64 = create_annotated_image(image, detections)
+            annotated_image_b64 = await sync_to_async(create_annotated_image, thread_sensitive=False)(
+                image, detections
+            )
 
             return JsonResponse({
                 "verifications": verified_seeds,
@@ -370,10 +614,11 @@ def verify_seed(request):
                 "total_not_found": len([s for s in verified_seeds if s["status"] == "not_found"]),
                 "processing_time_ms": processing_time,
                 "image_size": image_size,
-                "annotated_image": annotated_image_b64
+                "annotated_image": annotated_image_b64,
+                "partial": bool(timed_out or failed)
             })
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, httpx.HTTPError) as e:
             return JsonResponse({"error": str(e)}, status=500)
 
     return JsonResponse({"error": "Method not allowed"}, status=405)
@@ -385,48 +630,105 @@ def result(request, pk):
     return render(request, "result.html", {"analysis": seed})
 
 
+def _image_url(name):
+    """URL of a stored seed crop from its file name, without loading the model instance"""
+    return SeedImage._meta.get_field("image").storage.url(name) if name else None
+
+
 def history(request):
-    """API: Return all analyzed seed images"""
-    seeds = SeedImage.objects.all()
+    """API: Return analyzed seed images, newest first, one page at a time (?cursor=, ?limit=)"""
+    try:
+        rows, next_cursor = seed_page(
+            request.GET,
+            ["image", "prediction", "confidence", "quality", "blockchain_tx_id"],
+        )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
     data = [{
-        "id": s.id,
-        "image": s.image.url,
-        "prediction": s.prediction,
-        "confidence": s.confidence,
-        "quality": s.quality,
-        "blockchain_tx_id": s.blockchain_tx_id,
-        "uploaded_at": s.uploaded_at.isoformat(),
-    } for s in seeds]
-    return JsonResponse(data, safe=False)
+        "id": s["id"],
+        "image": _image_url(s["image"]),
+        "prediction": s["prediction"],
+        "confidence": s["confidence"],
+        "quality": s["quality"],
+        "blockchain_tx_id": s["blockchain_tx_id"],
+        "uploaded_at": s["uploaded_at"].isoformat(),
+    } for s in rows]
+    return JsonResponse({"records": data, "next_cursor": next_cursor})
 
 
 def database(request):
-    """API: Return database stats and seed records"""
-    seeds = SeedImage.objects.all()
-    blockchain_synced_count = seeds.exclude(blockchain_tx_id__isnull=True).exclude(blockchain_tx_id="").count()
-
-    data = {
-        "total": seeds.count(),
-        "blockchain_synced": blockchain_synced_count,
+    """API: Return one page of seed records (?cursor=, ?limit=, filters), plus totals on the first page"""
+    try:
+        rows, next_cursor = seed_page(
+            request.GET,
+            [
+                "prediction", "confidence", "quality", "blockchain_tx_id", "blockchain_type",
+                "signer_name", "certification_status", "image", "image_width", "image_height",
+                "processing_time_ms",
+            ],
+        )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    data = {"next_cursor": next_cursor}
+    if not request.GET.get("cursor"):
+        # Totals only on the first page; later pages are just more rows
+        totals = stats.summary()
+        data["total"] = totals["total"]
+        data["blockchain_synced"] = totals["blockchain_synced"]
+
+    data.update({
         "records": [{
-            "id": s.id,
-            "prediction": s.prediction,
-            "confidence": s.confidence,
-            "quality": s.quality,
-            "blockchain_tx_id": s.blockchain_tx_id,
-            "blockchain_type": s.blockchain_type,
-            "signer_name": s.signer_name,
-            "blockchain_synced": bool(s.blockchain_tx_id),
-            "uploaded_at": s.uploaded_at.isoformat(),
-            "image_url": s.image.url if s.image else None,
-            "image_width": s.image_width,
-            "image_height": s.image_height,
-            "processing_time_ms": s.processing_time_ms,
-        } for s in seeds]
-    }
+            "id": s["id"],
+            "prediction": s["prediction"],
+            "confidence": s["confidence"],
+            "quality": s["quality"],
+            "blockchain_tx_id": s["blockchain_tx_id"],
+            "blockchain_type": s["blockchain_type"],
+            "signer_name": s["signer_name"],
+            "certification_status": s["certification_status"],
+            "blockchain_synced": bool(s["blockchain_tx_id"]),
+            "uploaded_at": s["uploaded_at"].isoformat(),
+            "image_url": _image_url(s["image"]),
+            "image_width": s["image_width"],
+            "image_height": s["image_height"],
+            "processing_time_ms": s["processing_time_ms"],
+        } for s in rows]
+    })
     return JsonResponse(data)
 
 
+def seed_stats(request):
+    """API: Seed counters per class, quality, chain and signer, read from the materialised stats table"""
+    return JsonResponse(stats.summary())
+
+
+async def export_seeds(request):
+    """API: Stream every seed record as NDJSON, oldest first.
+
+    Takes the same filters as database; ?embeddings=true adds the vectors.
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+
+    try:
+        queryset = filter_seeds(SeedImage.objects.all(), request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    include_embeddings = request.GET.get("embeddings", "").lower() in ("1", "true", "yes")
+    rows = export.export_rows(queryset, include_embeddings)
+
+    async def lines():
+        # Server-side cursor, one chunk in memory at a time
+        async for row in rows.aiterator(chunk_size=export.EXPORT_CHUNK_SIZE):
+            yield export.to_ndjson(row)
+
+    response = StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+    response["Content-Disposition"] = 'attachment; filename="seeds.ndjson"'
+    return response
+
+
 @csrf_exempt
 def get_signers(request):
     """Get list of available signers/certifiers for dropdown"""
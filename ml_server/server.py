@@ -1,7 +1,12 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, Header, Depends
+from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
 import io
 import time
+import queue
+import asyncio
+import threading
 import base64
 from PIL import Image
 from datetime import datetime
@@ -10,10 +15,30 @@ import torch.nn.functional as F
 import numpy as np
 import os
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the scheduler, whose worker thread loads and warms up the models before serving"""
+    scheduler.start()
+
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 ML_API_KEY = os.getenv('ML_API_KEY', 'default-dev-key')
 
+# Max number of crops sent through the CNN in a single forward pass
+CNN_MAX_BATCH = int(os.getenv('CNN_MAX_BATCH', '32'))
+
+# Micro-batching: concurrent uploads are grouped for up to N ms or M images
+BATCH_MAX_IMAGES = int(os.getenv('BATCH_MAX_IMAGES', '8'))
+BATCH_MAX_WAIT_MS = int(os.getenv('BATCH_MAX_WAIT_MS', '20'))
+
+# Embedding wire formats selectable via the X-Embedding-Format header.
+# "list" is a plain JSON float list; the others are base64 little-endian buffers.
+EMBEDDING_DTYPES = {"float32": "<f4", "float16": "<f2"}
+
 async def verify_api_key(x_api_key: str = Header(...)):
     if x_api_key != ML_API_KEY:
         raise HTTPException(status_code=401, detail="Invalid API key")
@@ -25,42 +50,315 @@ def log(msg):
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"[{timestamp}] {msg}")
 
-# Global model variables (lazy loaded)
+
+class FeatureExtractor(torch.nn.Module):
+    """Wraps the checkpointed ResNet so one pass yields logits and the pooled embedding"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x):
+        m = self.model
+        x = m.maxpool(m.relu(m.bn1(m.conv1(x))))
+        x = m.layer4(m.layer3(m.layer2(m.layer1(x))))
+        embedding = torch.flatten(m.avgpool(x), 1)
+        logits = m.fc(embedding)
+        return logits, embedding
+
+
+# Global model variables (loaded by warm_up on the scheduler thread, or by the first batch if that failed)
 cnn_model = None
 cnn_transform = None
 class_names = None
 yolo_model = None
+model_lock = threading.Lock()
+
+# Readiness state reported by /ready/
+readiness = {"ready": False, "error": None, "timings_ms": {}}
 
 
 def load_models():
-    """Load YOLO and CNN models on first request"""
+    """Load YOLO and CNN models if they are not loaded yet"""
+    with model_lock:
+        _load_models()
+
+
+def _load_models():
     global cnn_model, cnn_transform, class_names, yolo_model
 
     if cnn_model is None:
         log("Loading CNN model...")
+        start_time = time.time()
         device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         checkpoint = torch.load('cnn_best.pth', map_location=device, weights_only=False)
-        cnn_model = checkpoint['model']
+        cnn_model = FeatureExtractor(checkpoint['model'])
         cnn_model.eval()
         cnn_model = cnn_model.to(device)
         log(f"CNN model loaded on device: {device}")
 
         cnn_transform = checkpoint['transform']
         class_names = checkpoint['class_names']
+        readiness["timings_ms"]["cnn_load"] = int((time.time() - start_time) * 1000)
 
     if yolo_model is None:
         log("Loading YOLO detection model...")
+        start_time = time.time()
         from ultralytics import YOLO
         yolo_model = YOLO('yolo_best.pt')
+        readiness["timings_ms"]["yolo_load"] = int((time.time() - start_time) * 1000)
         log("YOLO model loaded")
 
 
+def warm_up():
+    """Load both models and run a dummy inference so lazy kernel/JIT setup happens before traffic"""
+    try:
+        load_models()
+
+        start_time = time.time()
+        yolo_model(np.zeros((640, 640, 3), dtype=np.uint8), conf=0.25, verbose=False)
+        readiness["timings_ms"]["yolo_warmup"] = int((time.time() - start_time) * 1000)
+
+        # A blank frame gives YOLO no boxes, so exercise the CNN directly
+        start_time = time.time()
+        classify_crops([Image.new('RGB', (224, 224))])
+        readiness["timings_ms"]["cnn_warmup"] = int((time.time() - start_time) * 1000)
+
+        readiness["ready"] = True
+        log(f"Models ready: {readiness['timings_ms']}")
+    except Exception as e:
+        readiness["error"] = str(e)
+        log(f"ERROR: model warm-up failed: {str(e)}")
+
+
+def classify_crops(crops):
+    """Run the CNN over all crops in chunks of CNN_MAX_BATCH.
+
+    Returns a list of (class_name, confidence, embedding) in the same order as crops,
+    where embedding is a float32 NumPy vector.
+    """
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    results = []
+
+    for start in range(0, len(crops), CNN_MAX_BATCH):
+        chunk = crops[start:start + CNN_MAX_BATCH]
+        batch = torch.stack([cnn_transform(crop) for crop in chunk]).to(device)
+
+        with torch.no_grad():
+            # Logits and pooled embedding (digital fingerprint) from a single pass
+            outputs, features = cnn_model(batch)
+            probs = F.softmax(outputs, dim=1)
+            top_conf, top_class = probs.max(1)
+            embeddings = features.cpu().numpy()
+
+        for conf, cls, embedding in zip(top_conf.tolist(), top_class.tolist(), embeddings):
+            results.append((class_names[cls], float(conf), embedding))
+
+    return results
+
+
+def decode_image(contents):
+    """Decode an upload into an RGB image. Raises for anything that isn't a readable image."""
+    return Image.open(io.BytesIO(contents)).convert('RGB')
+
+
+def run_inference(items):
+    """Run YOLO + CNN over a batch of (rgb_image, filename, include_crops) uploads.
+
+    Images are decoded by the caller, so one bad upload can't fail the batch.
+    Returns one {"results", "image_size"} dict per upload, in order.
+    """
+    load_models()
+
+    images = [image for image, _, _ in items]
+
+    # Stage 1: YOLO Detection (all images in one call)
+    yolo_results = yolo_model([np.array(image) for image in images], conf=0.25)
+
+    # Collect every crop first so the CNN runs once per chunk, not once per box
+    owners = []
+    bboxes = []
+    crops = []
+    for idx, (image, (_, filename, _), result) in enumerate(zip(images, items, yolo_results)):
+        if len(result.boxes) == 0:
+            log(f"No objects detected in {filename}")
+        for box in result.boxes:
+            # Get bounding box coordinates
+            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+            bbox = [int(x1), int(y1), int(x2), int(y2)]
+
+            # Crop region for CNN classification
+            owners.append(idx)
+            bboxes.append(bbox)
+            crops.append(image.crop(tuple(bbox)))
+
+    # Stage 2: CNN Classification (batched across every upload)
+    classifications = classify_crops(crops)
+
+    outputs = [
+        {"results": [], "image_size": {"width": image.width, "height": image.height}}
+        for image in images
+    ]
+
+    for owner, bbox, crop, (cnn_class_name, top_conf, embedding) in zip(owners, bboxes, crops, classifications):
+        if top_conf > 0.8:
+            quality = "High"
+        elif top_conf > 0.5:
+            quality = "Medium"
+        else:
+            quality = "Low"
+
+        detection = {
+            "bbox": bbox,
+            "class": cnn_class_name,
+            "confidence": round(top_conf, 3),
+            "quality": quality,
+            "embedding": embedding,
+        }
+
+        # Callers that still have the original upload crop from bbox themselves
+        include_crops = items[owner][2]
+        if include_crops:
+            buffered = io.BytesIO()
+            crop.save(buffered, format="JPEG")
+            detection["cropped_image"] = base64.b64encode(buffered.getvalue()).decode('utf-8')
+
+        outputs[owner]["results"].append(detection)
+
+    return outputs
+
+
+def encode_embedding(embedding, embedding_format):
+    """Serialize a float32 embedding for the response in the requested format"""
+    if embedding_format == "list":
+        return embedding.tolist()
+    buffer = np.ascontiguousarray(embedding, dtype=EMBEDDING_DTYPES[embedding_format])
+    return base64.b64encode(buffer.tobytes()).decode('ascii')
+
+
+def _resolve(future, result, error):
+    """Complete a request future from the event loop thread"""
+    if future.cancelled():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class InferenceScheduler:
+    """Groups concurrent /predict/ requests and runs them through the models together.
+
+    Requests are handed to a single worker thread, which waits up to
+    max_wait_ms for up to max_images uploads before running one batch.
+    on_start runs on that thread before the first batch; the models are only
+    ever called from it, since the predictors aren't thread-safe.
+    """
+
+    def __init__(self, max_images, max_wait_ms, on_start=None):
+        self.max_images = max(1, max_images)
+        self.max_wait = max_wait_ms / 1000
+        self.on_start = on_start
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+        # Metrics
+        self.batches = 0
+        self.images = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._worker, name="inference-scheduler", daemon=True)
+                self.thread.start()
+
+    async def submit(self, image, filename, include_crops=True):
+        """Queue one decoded upload and wait for its inference result"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.queue.put(((image, filename, include_crops), loop, future))
+        return await future
+
+    def _collect(self):
+        """Block for the first request, then gather more until the batch is full or the window closes"""
+        pending = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(pending) < self.max_images:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return pending
+
+    def _worker(self):
+        if self.on_start:
+            # Requests arriving meanwhile wait in the queue
+            self.on_start()
+
+        while True:
+            pending = self._collect()
+
+            with self.lock:
+                self.batches += 1
+                self.images += len(pending)
+                self.last_batch_size = len(pending)
+                self.max_batch_size = max(self.max_batch_size, len(pending))
+
+            try:
+                results = run_inference([item for item, _, _ in pending])
+            except Exception as e:
+                log(f"ERROR: batch of {len(pending)} failed: {str(e)}")
+                for _, loop, future in pending:
+                    loop.call_soon_threadsafe(_resolve, future, None, e)
+                continue
+
+            for (_, loop, future), result in zip(pending, results):
+                loop.call_soon_threadsafe(_resolve, future, result, None)
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "batches": self.batches,
+                "images": self.images,
+                "avg_batch_size": round(self.images / self.batches, 2) if self.batches else 0,
+                "last_batch_size": self.last_batch_size,
+                "max_batch_size": self.max_batch_size,
+                "max_images": self.max_images,
+                "max_wait_ms": int(self.max_wait * 1000),
+            }
+
+
+scheduler = InferenceScheduler(BATCH_MAX_IMAGES, BATCH_MAX_WAIT_MS, on_start=warm_up)
+
+
 @app.get("/health/")
 def health():
     log("Health check received")
     return {"status": "ok"}
 
 
+@app.get("/ready/")
+def ready():
+    """Readiness probe: 200 only once models are loaded and warmed up"""
+    status_code = 200 if readiness["ready"] else 503
+    return JSONResponse(status_code=status_code, content=readiness)
+
+
+@app.get("/metrics/")
+def metrics():
+    return scheduler.metrics()
+
+
 class Ping(BaseModel):
     msg: str
 
@@ -132,81 +430,40 @@ class Ping(BaseModel):
 
 
 @app.post("/predict/", dependencies=[Depends(verify_api_key)])
-async def predict(file: UploadFile = File(...)):
+async def predict(
+    file: UploadFile = File(...),
+    x_embedding_format: str = Header("list"),
+    x_include_crops: bool = Header(True),
+):
     """
     Two-stage inference:
     1. YOLO detects objects/regions → bounding boxes
     2. CNN classifies each detected region → quality/class scores
+
+    The actual inference runs on the scheduler thread, batched with other
+    concurrent uploads, so the event loop stays free.
+
+    Send "X-Include-Crops: false" to get bboxes only, without base64 JPEG crops.
     """
-    from ultralytics import YOLO
+    if x_embedding_format != "list" and x_embedding_format not in EMBEDDING_DTYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported embedding format: {x_embedding_format}")
 
     log(f"YOLO prediction request: {file.filename}")
     start_time = time.time()
 
+    # Decode here, off the event loop, so a corrupt upload fails only its own request
+    contents = await file.read()
     try:
-        load_models()
+        image = await asyncio.to_thread(decode_image, contents)
+    except Exception as e:
+        log(f"ERROR: unreadable image {file.filename}: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid image: {str(e)}")
 
-        contents = await file.read()
-        image = Image.open(io.BytesIO(contents)).convert('RGB')
-        img_array = np.array(image)
-
-        # Stage 1: YOLO Detection
-        yolo_results = yolo_model(img_array, conf=0.25)
-        detections = []
-
-        # Process each detection
-        for result in yolo_results:
-            if len(result.boxes) == 0:
-                log(f"No objects detected in {file.filename}")
-            boxes = result.boxes
-            for box in boxes:
-                # Get bounding box coordinates
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-
-                # Crop region for CNN classification
-                crop = image.crop((int(x1), int(y1), int(x2), int(y2)))
-
-                # Stage 2: CNN Classification
-                crop_tensor = cnn_transform(crop).unsqueeze(0)
-                if torch.cuda.is_available():
-                    crop_tensor = crop_tensor.cuda()
-
-                with torch.no_grad():
-                    outputs = cnn_model(crop_tensor)
-                    probs = F.softmax(outputs, dim=1)
-                    top_conf, top_class = probs.max(1)
-                    top_conf = float(top_conf)
-                    cnn_class_name = class_names[int(top_class)]
-
-                    # Extract embeddings using adaptive average pooling
-                    # Get the output of the last conv layer before fc
-                    features = cnn_model.avgpool(cnn_model.layer4(
-                        cnn_model.layer3(cnn_model.layer2(cnn_model.layer1(
-                            cnn_model.maxpool(cnn_model.relu(cnn_model.bn1(cnn_model.conv1(crop_tensor))))
-                        )))
-                    ))
-                    embedding = features.view(features.size(0), -1).cpu().numpy()[0].tolist()
-
-                if top_conf > 0.8:
-                    quality = "High"
-                elif top_conf > 0.5:
-                    quality = "Medium"
-                else:
-                    quality = "Low"
-
-                # Convert cropped image to base64
-                buffered = io.BytesIO()
-                crop.save(buffered, format="JPEG")
-                crop_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
-
-                detections.append({
-                    "bbox": [int(x1), int(y1), int(x2), int(y2)],
-                    "class": cnn_class_name,
-                    "confidence": round(top_conf, 3),
-                    "quality": quality,
-                    "embedding": embedding,
-                    "cropped_image": crop_base64  # Base64 encoded cropped image
-                })
+    try:
+        result = await scheduler.submit(image, file.filename, x_include_crops)
+        detections = result["results"]
+        for detection in detections:
+            detection["embedding"] = encode_embedding(detection["embedding"], x_embedding_format)
 
         processing_time = int((time.time() - start_time) * 1000)
 
@@ -215,7 +472,8 @@ async def predict(file: UploadFile = File(...)):
         return {
             "results": detections,
             "processing_time_ms": processing_time,
-            "image_size": {"width": image.width, "height": image.height}
+            "image_size": result["image_size"],
+            "embedding_format": x_embedding_format
         }
 
     except Exception as e: